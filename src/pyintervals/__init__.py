@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+from .comparable import Comparable
+from .cursor import Cursor
 from .interval import Interval, contains, overlaps
 from .interval_handler import IntervalHandler
-from .time_value_node import TimeValueNode
+from .lazy import LazyHandler
+from .segment_tree import SegmentTreeHandler
+from .time_value_node import ProjectionGraphView, TimeValueNode
+from .views import MultisetView, SequenceView
 
 __version__ = __import__("importlib.metadata").metadata.version(__name__)
 
 __all__ = [
     # document & pages
+    "Comparable",
     "Interval",
     "overlaps",
     "contains",
     "IntervalHandler",
+    "LazyHandler",
+    "SegmentTreeHandler",
     "TimeValueNode",
+    "Cursor",
+    "ProjectionGraphView",
+    "SequenceView",
+    "MultisetView",
 ]
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any, Protocol, TypeVar
+
+
+class Comparable(Protocol):
+    """A point on the axis of intervals, such as a `datetime`, an `int` or a `float`.
+
+    Any totally ordered and hashable type will do. Only the time points of a single
+    axis are compared with each other.
+    """
+
+    def __lt__(self, other: Any, /) -> bool: ...
+
+    def __le__(self, other: Any, /) -> bool: ...
+
+    def __gt__(self, other: Any, /) -> bool: ...
+
+    def __ge__(self, other: Any, /) -> bool: ...
+
+    def __hash__(self) -> int: ...
+
+
+T = TypeVar("T", bound=Comparable)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Generic
+
+from .comparable import T
+from .time_value_node import TimeValueNode
+
+if TYPE_CHECKING:
+    from .interval_handler import IntervalHandler
+
+# How many nodes to step over one by one, before looking the time point up instead.
+_STEPS = 8
+
+
+class Cursor(Generic[T]):
+    """Looks up the nodes of a handler at increasing time points, remembering where it left off.
+
+    Advancing to a time point within a few nodes of the previous one costs O(1),
+    while farther jumps fall back to an O(log n) lookup. Moving backwards, or
+    advancing after the handler has changed, looks the time point up again,
+    so `advance_to` always returns the same node as `node_at_time`.
+    """
+
+    __slots__ = ("_handler", "_version", "_node", "_next", "_ahead")
+
+    def __init__(self, handler: IntervalHandler[T], start: T) -> None:
+        self._handler = handler
+        self._version = handler._version
+        self._node: TimeValueNode[T]
+        self._next: TimeValueNode[T] | None
+        self._ahead: Iterator[TimeValueNode[T]]
+        self._seek(start)
+
+    @property
+    def node(self) -> TimeValueNode[T]:
+        """The node the cursor is at."""
+        return self._node
+
+    def _seek(self, when: T) -> None:
+        nodes = self._handler._nodes
+        if not (index := nodes.bisect_key_right(when)):
+            raise RuntimeError("Could not find active node at time.")
+        self._version = self._handler._version
+        self._node = nodes[index - 1]
+        self._ahead = nodes.islice(index)
+        self._next = next(self._ahead, None)
+
+    def advance_to(self, when: T) -> TimeValueNode[T]:
+        """Moves to the node active at `when` and returns it."""
+        if self._version != self._handler._version or when < self._node.time_point:
+            self._seek(when)
+            return self._node
+        for _ in range(_STEPS):
+            if self._next is None or when < self._next.time_point:
+                return self._node
+            self._node, self._next = self._next, next(self._ahead, None)
+        if self._next is not None and not when < self._next.time_point:
+            self._seek(when)
+        return self._node
@@ -1,46 +1,118 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timedelta
-from functools import cached_property
+from typing import Any, Generic, overload
 
+from .comparable import T
 
-@dataclass(frozen=True, order=True)
-class Interval:
-    start: datetime
-    end: datetime
-    value: float = field(default=0)
 
-    def __post_init__(self) -> None:
-        if self.start > self.end:
-            raise RuntimeError(f"Invalid interval: {self.end=} is earlier than {self.start=}")
+class Interval(Generic[T]):
+    """An immutable timespan from `start` until `end`, with an associated `value`.
 
-    @cached_property
-    def is_degenerate(self) -> bool:
-        return self.start == self.end
+    The bounds are usually `datetime`s, but can be any `Comparable`, e.g. `int` or `float`.
 
-    def duration(self) -> timedelta:
+    Behaves like a frozen and ordered dataclass of `start`, `end` and `value`,
+    but keeps its fields in slots, so that an instance carries no `__dict__`.
+    Degeneracy is computed once, and comparisons go field by field without
+    building tuples.
+    """
+
+    __slots__ = ("start", "end", "value", "is_degenerate")
+    __match_args__ = ("start", "end", "value")
+
+    start: T
+    end: T
+    value: float
+    is_degenerate: bool
+
+    def __init__(self, start: T, end: T, value: float = 0) -> None:
+        if start > end:
+            raise RuntimeError(f"Invalid interval: self.end={end!r} is earlier than self.start={start!r}")
+        object.__setattr__(self, "start", start)
+        object.__setattr__(self, "end", end)
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "is_degenerate", start == end)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __reduce__(self) -> tuple[type[Interval[T]], tuple[T, T, float]]:
+        return self.__class__, (self.start, self.end, self.value)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(start={self.start!r}, end={self.end!r}, value={self.value!r})"
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.end, self.value))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Interval) or other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.start == other.start and self.end == other.end and self.value == other.value
+
+    def __lt__(self, other: Interval[T]) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        if self.start != other.start:
+            return self.start < other.start
+        if self.end != other.end:
+            return self.end < other.end
+        return self.value < other.value
+
+    def __le__(self, other: Interval[T]) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        if self.start != other.start:
+            return self.start < other.start
+        if self.end != other.end:
+            return self.end < other.end
+        return self.value <= other.value
+
+    def __gt__(self, other: Interval[T]) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return other < self
+
+    def __ge__(self, other: Interval[T]) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return other <= self
+
+    @overload
+    def duration(self: Interval[datetime]) -> timedelta: ...
+
+    @overload
+    def duration(self: Interval[int]) -> int: ...
+
+    @overload
+    def duration(self: Interval[float]) -> float: ...
+
+    def duration(self: Interval[Any]) -> Any:
         return self.end - self.start
 
-    def overlaps_with(self, other: Interval) -> bool:
+    def overlaps_with(self, other: Interval[T]) -> bool:
         return overlaps(self, other)
 
-    def contains(self, other: Interval) -> bool:
+    def contains(self, other: Interval[T]) -> bool:
         return contains(self, other)
 
 
-def _get_ordered(interval: Interval, other: Interval) -> tuple[Interval, Interval]:
+def _get_ordered(interval: Interval[T], other: Interval[T]) -> tuple[Interval[T], Interval[T]]:
     return (interval, other) if interval.start <= other.start else (other, interval)
 
 
-def contains_point(interval: Interval, point: datetime) -> bool:
+def contains_point(interval: Interval[T], point: T) -> bool:
     if interval.is_degenerate:
         return interval.start == point
     else:
         return interval.start <= point < interval.end
 
 
-def overlaps(interval: Interval, other: Interval) -> bool:
+def overlaps(interval: Interval[T], other: Interval[T]) -> bool:
     # If both are degenerate, then we should check
     # whether they're at the exact same time.
     if interval.is_degenerate and other.is_degenerate:
@@ -60,7 +132,7 @@ def overlaps(interval: Interval, other: Interval) -> bool:
     return second.start < first.end
 
 
-def contains(interval: Interval, other: Interval) -> bool:
+def contains(interval: Interval[T], other: Interval[T]) -> bool:
     # If the other interval is degenerate, then we can check with overlaps.
     if other.is_degenerate:
         return overlaps(interval, other)
@@ -69,7 +141,7 @@ def contains(interval: Interval, other: Interval) -> bool:
     return interval.start <= other.start and interval.end >= other.end
 
 
-def intersection(interval: Interval, other_interval: Interval) -> Interval | None:
+def intersection(interval: Interval[T], other_interval: Interval[T]) -> Interval[T] | None:
     if overlaps(interval, other_interval):
         return Interval(
             max([interval.start, other_interval.start]),
@@ -1,39 +1,70 @@
 from __future__ import annotations
 
+import functools
+import heapq
 import itertools
+import math
 import operator
-from collections.abc import Callable, Collection, Iterable
-from dataclasses import dataclass
+import weakref
+from collections import Counter, defaultdict
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Generic, cast, overload
 from zoneinfo import ZoneInfo
 
 import more_itertools
-from sortedcontainers import SortedList
+from sortedcontainers import SortedKeyList, SortedList
 
+from .comparable import T
 from .constants import TIME_ZERO
-from .interval import Interval
-from .search import weak_predecessor
-from .time_value_node import TimeValueNode, _simplify
+from .cursor import Cursor
+from .interval import Interval, contains_point
+from .interval_tree import IntervalTree
+from .search import weak_predecessors
+from .segment_tree import SegmentTree
+from .ticks import TICK, tick_zone, to_ticks
+from .time_value_node import ProjectionGraphView, TimeValueNode
+from .views import MultisetView
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from .lazy import LazyHandler
+
+# Walking this many nodes per queried time point costs about as much as looking each one up.
+_NODES_PER_LOOKUP = 50
 
 
 def _to_new_node(
-    active_node: TimeValueNode | None,
-    time_point: datetime,
-) -> TimeValueNode | None:
+    active_node: TimeValueNode[T] | None,
+    time_point: T,
+) -> TimeValueNode[T] | None:
     if active_node is None:
         return TimeValueNode(time_point)
 
     return TimeValueNode.copy(active_node, time_point) if active_node.time_point < time_point else None
 
 
-def _active_node_at_time(nodes: SortedList[TimeValueNode], when: datetime) -> TimeValueNode:
-    if node := weak_predecessor(nodes, TimeValueNode(when)):
-        return node
+def _graph(nodes: Iterable[TimeValueNode[T]] = ()) -> SortedKeyList[TimeValueNode[T], T]:
+    """Sorts `nodes` by their time points, so that looking up a time point needs no node to compare with."""
+    return SortedKeyList(nodes, key=operator.attrgetter("time_point"))
+
+
+def _active_index(nodes: SortedKeyList[TimeValueNode[T], T], when: T) -> int:
+    if index := nodes.bisect_key_right(when):
+        return index - 1
     else:
         raise RuntimeError("Could not find active node at time.")
 
 
-def _make_range(nodes: SortedList[TimeValueNode], new_interval: Interval) -> None:
+def _active_node_at_time(nodes: SortedKeyList[TimeValueNode[T], T], when: T) -> TimeValueNode[T]:
+    return nodes[_active_index(nodes, when)]
+
+
+def _make_range(nodes: SortedKeyList[TimeValueNode[T], T], new_interval: Interval[T]) -> None:
     for t in {new_interval.start, new_interval.end}:
         if new_node := _to_new_node(
             active_node=_active_node_at_time(nodes, t),
@@ -42,178 +73,896 @@ def _make_range(nodes: SortedList[TimeValueNode], new_interval: Interval) -> Non
             nodes.add(new_node)
 
 
-def _operate(
-    a: IntervalHandler,
-    b: IntervalHandler,
+def _sum_tree(k: int) -> list[float]:
+    """A binary tree of partial sums over k leaves, all 0, with the total at index 1."""
+    return [0.0] * (2 << max(k - 1, 0).bit_length())
+
+
+def _set_leaf(tree: list[float], i: int, value: float) -> None:
+    """Sets the i-th leaf of a tree of partial sums, and the sums above it, in O(log k)."""
+    position = len(tree) // 2 + i
+    tree[position] = value
+    while position > 1:
+        position //= 2
+        tree[position] = tree[2 * position] + tree[2 * position + 1]
+
+
+def _check_origin(interval: Interval[T], origin: T) -> None:
+    if interval.start < origin:
+        raise ValueError(f"{interval} starts before the origin {origin}.")
+
+
+def _sweep(
+    intervals: Sequence[Interval[T]],
+    origin: T,
+    resolve: Callable[[T], SortedList[Interval[T]]] | None = None,
+) -> list[TimeValueNode[T]]:
+    """Builds the projection graph of `intervals` in a single pass over their sorted boundaries.
+
+    Produces the same nodes as adding the intervals one by one, i.e. one node at `origin`
+    and one per distinct start or end, without repeatedly walking the graph.
+    If `resolve` is given, the nodes keep no snapshot of their active intervals.
+
+    The values are kept in a binary tree of partial sums, one leaf per interval, rather than
+    in a running total. Each node's value then depends only on its active intervals, so that
+    rounding errors do not pile up along the sweep, and no intervals give exactly 0.
+    """
+    starting: defaultdict[T, list[tuple[int, Interval[T]]]] = defaultdict(list)
+    ending: defaultdict[T, list[tuple[int, Interval[T]]]] = defaultdict(list)
+    for i, interval in enumerate(intervals):
+        _check_origin(interval, origin)
+        starting[interval.start].append((i, interval))
+        ending[interval.end].append((i, interval))
+
+    active: SortedList[Interval[T]] = SortedList()
+    tree = _sum_tree(len(intervals))
+    nodes = []
+    for time_point in sorted({origin, *starting, *ending}):
+        for i, interval in ending.get(time_point, []):
+            if not interval.is_degenerate:
+                _set_leaf(tree, i, 0.0)
+                if resolve is None:
+                    active.remove(interval)
+
+        degenerates = []
+        for i, interval in starting.get(time_point, []):
+            if interval.is_degenerate:
+                degenerates.append(interval)
+            else:
+                _set_leaf(tree, i, interval.value)
+                if resolve is None:
+                    active.add(interval)
+
+        node_intervals = None
+        if resolve is None:
+            node_intervals = SortedList(active)
+            node_intervals.update(degenerates)
+        nodes.append(
+            TimeValueNode(
+                time_point,
+                node_intervals,
+                [interval for _, interval in starting.get(time_point, [])],
+                [interval for _, interval in ending.get(time_point, [])],
+                tree[1],
+                resolve,
+            )
+        )
+    return nodes
+
+
+def _merge_values(
+    a: Iterable[TimeValueNode[T]],
+    b: Iterable[TimeValueNode[T]],
+) -> Iterator[tuple[T, float, float]]:
+    """Merges two projection graphs into their union of time points, along with the value of each at that time.
+
+    Both graphs are walked once side by side, in O(n + m).
+    """
+    a_nodes, b_nodes = iter(a), iter(b)
+    node_a, node_b = next(a_nodes, None), next(b_nodes, None)
+    value_a = value_b = 0.0
+    while node_a is not None or node_b is not None:
+        time_point = min(n.time_point for n in (node_a, node_b) if n is not None)
+        if node_a is not None and node_a.time_point == time_point:
+            value_a = node_a.value
+            node_a = next(a_nodes, None)
+        if node_b is not None and node_b.time_point == time_point:
+            value_b = node_b.value
+            node_b = next(b_nodes, None)
+        yield time_point, value_a, value_b
+
+
+def _merged(segments: Iterable[tuple[T, T, float]]) -> Iterator[tuple[T, T, float]]:
+    """Joins consecutive segments of equal value."""
+    current: tuple[T, T, float] | None = None
+    for start, end, value in segments:
+        if current is None:
+            current = (start, end, value)
+        elif current[2] == value:
+            current = (current[0], end, value)
+        else:
+            yield current
+            current = (start, end, value)
+    if current is not None:
+        yield current
+
+
+def _mapped(a: IntervalHandler[T], fn: Callable[[float], float]) -> Iterator[tuple[T, T, float]]:
+    """Applies `fn` to the value of each segment of `a`, in a single pass over its nodes."""
+    return _merged(
+        (start.time_point, end.time_point, fn(start.value)) for start, end in more_itertools.pairwise(a._nodes)
+    )
+
+
+def _segments(
+    a: IntervalHandler[T],
+    b: IntervalHandler[T] | float,
     operand: Callable[[float, float], float],
-) -> IntervalHandler:
-    """Only call this function through the methods bound to `IntervalHandler`."""
+) -> Iterator[tuple[T, T, float]]:
+    if isinstance(b, (int, float)):
+        scalar = b
+        return _mapped(a, lambda value: operand(value, scalar))
     if not isinstance(b, IntervalHandler):
         raise TypeError(f"unsupported operand type(s) for {operand.__name__}: " f"'{type(a)}' and '{type(b)}'")
-    change_times = set(n.time_point for n in itertools.chain(a.projection_graph, b.projection_graph))
-
-    return IntervalHandler(
-        intervals=[
-            Interval(
-                start=start,
-                end=end,
-                value=operand(a.value_at_time(start), b.value_at_time(start)),
-            )
-            for start, end in more_itertools.pairwise(sorted(change_times))
-        ],
-        tz=a._tz,
+
+    return (
+        (start, end, operand(value_a, value_b))
+        for (start, value_a, value_b), (end, _, _) in more_itertools.pairwise(_merge_values(a._nodes, b._nodes))
     )
 
 
-def _relevant_nodes(
-    nodes: SortedList[TimeValueNode],
-    interval: Interval,
-) -> list[TimeValueNode]:
-    if interval.is_degenerate:
-        return [_active_node_at_time(nodes, interval.start)]
-    else:
-        return [
-            n
-            for n in nodes.islice(start=nodes.index(_active_node_at_time(nodes, interval.start)))
-            if n.time_point <= interval.end
-        ]
+def _reflected(operand: Callable[[float, float], float]) -> Callable[[float, float], float]:
+    """Swaps the operands of `operand`, for a scalar on its left."""
 
+    @functools.wraps(operand)
+    def reflected(a: float, b: float) -> float:
+        return operand(b, a)
 
-def _area_during_interval(handler: IntervalHandler, during: Interval) -> timedelta:
-    first_node_in_interval = handler.node_at_time(during.start).copy(during.start)
-    last_node_in_interval = handler.node_at_time(during.end).copy(during.end)
+    return reflected
 
-    relevant_nodes = itertools.chain(
-        [first_node_in_interval],
-        # ↓ Everything except the first node, since it's not ↓
-        # ↓ necessarily part of the interval ↓
-        _relevant_nodes(handler.projection_graph, during)[1:],
-        [last_node_in_interval],
-    )
 
-    return sum(
-        (
-            during.value * start.value * (end.time_point - start.time_point)
-            for start, end in more_itertools.pairwise(relevant_nodes)
-        ),
-        start=timedelta(0),
+def _operate(
+    a: IntervalHandler[T],
+    b: object,
+    operand: Callable[[float, float], float],
+) -> IntervalHandler[T]:
+    """Only call this function through the methods bound to `IntervalHandler`.
+
+    Returns `NotImplemented` for other operands, so that Python tries their reflected operator.
+    """
+    if not isinstance(b, (IntervalHandler, int, float)):
+        return NotImplemented
+    return IntervalHandler._from_segments(_segments(a, b, operand), tz=a._tz, snapshots=a._snapshots, origin=a._origin)
+
+
+def _operate_in_place(
+    a: IntervalHandler[T],
+    b: object,
+    operand: Callable[[float, float], float],
+) -> IntervalHandler[T]:
+    """Only call this function through the methods bound to `IntervalHandler`.
+
+    Adding or subtracting a handler adds its segments as intervals, so that only the nodes
+    where it is non-zero change, and the intervals of `a` are kept.
+    """
+    if not isinstance(b, (IntervalHandler, int, float)):
+        return NotImplemented
+    if isinstance(b, IntervalHandler) and operand in (operator.add, operator.sub):
+        sign = 1 if operand is operator.add else -1
+        deltas = _mapped(b, lambda value: sign * value)
+        a.add([Interval(start, end, value) for start, end, value in deltas if value])
+        return a
+    a._assign_segments(_segments(a, b, operand))
+    return a
+
+
+def _tagged(graph: Iterable[TimeValueNode[T]], i: int) -> Iterator[tuple[T, int, float]]:
+    return ((node.time_point, i, node.value) for node in graph)
+
+
+def _changes(graphs: Sequence[Iterable[TimeValueNode[T]]]) -> Iterator[tuple[T, list[tuple[int, float]]]]:
+    """Merges projection graphs into their union of time points, along with the graphs changing value there.
+
+    All graphs are walked once with a heap, in O(N log k) for N nodes in k graphs.
+    """
+    merged = heapq.merge(*(_tagged(graph, i) for i, graph in enumerate(graphs)), key=operator.itemgetter(0))
+    for time_point, group in itertools.groupby(merged, key=operator.itemgetter(0)):
+        yield time_point, [(i, value) for _, i, value in group]
+
+
+def _sums(changes: Iterable[tuple[T, list[tuple[int, float]]]], k: int) -> Iterator[tuple[T, float]]:
+    """Yields the total of k graphs at each time point, in O(log k) per change.
+
+    The partial sums are kept in a binary tree rather than in a running total,
+    so that the total depends only on the current values and rounding errors do not pile up.
+    """
+    tree = _sum_tree(k)
+    for time_point, changed in changes:
+        for i, value in changed:
+            _set_leaf(tree, i, value)
+        yield time_point, tree[1]
+
+
+def _aggregates(
+    changes: Iterable[tuple[T, list[tuple[int, float]]]],
+    k: int,
+    fn: Callable[[Sequence[float]], float],
+) -> Iterator[tuple[T, float]]:
+    values = [0.0] * k
+    previous: T | None = None
+    for time_point, changed in changes:
+        if previous is not None:
+            yield previous, fn(tuple(values))
+        for i, value in changed:
+            values[i] = value
+        previous = time_point
+    if previous is not None:
+        # Like for the operators, nothing starts at the last time point, so `fn` is not called for it.
+        yield previous, 0.0
+
+
+def _clamped(
+    changes: Iterable[tuple[T, list[tuple[int, float]]]], start: T
+) -> Iterator[tuple[T, list[tuple[int, float]]]]:
+    """Moves the changes up to `start` to `start` itself, keeping the latest value of each graph."""
+    head: list[tuple[int, float]] = []
+    for time_point, changed in changes:
+        if time_point <= start:
+            head.extend(changed)
+            continue
+        if head:
+            yield start, head
+            head = []
+        yield time_point, changed
+    if head:
+        yield start, head
+
+
+def _handlers(handlers: Iterable[IntervalHandler[T]], name: str) -> list[IntervalHandler[T]]:
+    handlers = list(handlers)
+    for handler in handlers:
+        if not isinstance(handler, IntervalHandler):
+            raise TypeError(f"unsupported operand type for {name}: '{type(handler)}'")
+    return handlers
+
+
+def _combine(handlers: Sequence[IntervalHandler[T]], values: Iterable[tuple[T, float]]) -> IntervalHandler[T]:
+    """Only call this function through the methods bound to `IntervalHandler`."""
+    if not handlers:
+        return IntervalHandler()
+    first = handlers[0]
+    return IntervalHandler._from_segments(
+        ((start, end, value) for (start, value), (end, _) in more_itertools.pairwise(values)),
+        tz=first._tz,
+        snapshots=first._snapshots,
+        origin=first._origin,
     )
 
 
+def _relevant_nodes(
+    nodes: SortedKeyList[TimeValueNode[T], T],
+    interval: Interval[T],
+) -> list[TimeValueNode[T]]:
+    """Returns the nodes from the one active at the start of `interval` up to its end, in O(log n + k)."""
+    if interval.is_degenerate:
+        return [_active_node_at_time(nodes, interval.start)]
+    else:
+        first, stop = _active_index(nodes, interval.start), nodes.bisect_key_right(interval.end)
+        return nodes[first:stop]
+
+
 @dataclass
-class IntervalHandler:
-    __intervals: list[Interval]
-    __projection_graph: SortedList[TimeValueNode]
+class IntervalHandler(Generic[T]):
+    """Owns intervals and projects their aggregated value over time.
+
+    By default, every node of the projection graph keeps a snapshot of its active
+    intervals. With `snapshots=False`, nodes only keep the intervals starting and
+    ending at them, and the active intervals are looked up when asked for. This
+    keeps the memory linear in the number of intervals, regardless of their overlap.
+
+    The axis is `datetime` by default, starting at `TIME_ZERO` in the time zone `tz`.
+    Other comparable axes, such as `int` or `float`, are used by passing the `origin`
+    they start at. No interval may start before the origin.
+
+    The value is 0 from the last time point of the projection graph on, where all intervals
+    have ended. The results of the operators, `minimum`, `maximum`, `clip` and `apply` are
+    handlers too, so that they are 0 there as well, even where a scalar operand or `fn`
+    would give another value, e.g. for `handler + 5` or `handler.clip(lower=2)`.
+    """
+
+    __intervals: Counter[Interval[T]]
+    __projection_graph: SortedKeyList[TimeValueNode[T], T]
     _tz: ZoneInfo | timezone | None
-    __first_negative: TimeValueNode | None = None
+    _origin: T = field(compare=False, repr=False)
+    _snapshots: bool = field(default=True, compare=False)
+    __version: int = field(default=0, compare=False, repr=False)
+    __value_arrays: tuple[npt.NDArray[np.int64 | np.float64], npt.NDArray[np.float64]] | None = field(
+        default=None, compare=False, repr=False
+    )
+    __interval_tree: IntervalTree[T] | None = field(default=None, compare=False, repr=False)
+    __segment_tree: SegmentTree[T] | None = field(default=None, compare=False, repr=False)
+    __pending: Counter[Interval[T]] = field(default_factory=Counter, compare=False, repr=False)
+    _batching: int = field(default=0, compare=False, repr=False)
+    __subscribers: weakref.WeakSet[LazyHandler[Any]] = field(default_factory=weakref.WeakSet, compare=False, repr=False)
+    # The expression a handler was evaluated from, kept alive for as long as the handler,
+    # so that it goes on following the changes of the handlers in the expression.
+    _expression: LazyHandler[Any] | None = field(default=None, compare=False, repr=False)
 
     def __init__(
         self,
-        intervals: Iterable[Interval] = [],
+        intervals: Iterable[Interval[T]] = [],
         tz: ZoneInfo | timezone | None = None,
+        snapshots: bool = True,
+        origin: T | None = None,
     ):
-        self._initialize(tz)
-        self.add(intervals)
+        self._snapshots = snapshots
+        self.__pending = Counter()
+        self.__subscribers = weakref.WeakSet()
+        self.__intervals = Counter()
+        self.__projection_graph = _graph()
+        self._origin = cast(T, TIME_ZERO.replace(tzinfo=tz)) if origin is None else origin
+        self._initialize(tz, intervals)
+
+    @classmethod
+    def from_intervals(
+        cls,
+        intervals: Iterable[Interval[T]],
+        tz: ZoneInfo | timezone | None = None,
+        snapshots: bool = True,
+        origin: T | None = None,
+    ) -> IntervalHandler[T]:
+        """Bulk loads `intervals` with a single sweep in O(n log n).
+
+        The resulting handler is identical to adding the intervals one by one.
+        """
+        return cls(intervals=intervals, tz=tz, snapshots=snapshots, origin=origin)
+
+    @classmethod
+    def _from_segments(
+        cls,
+        segments: Iterable[tuple[T, T, float]],
+        tz: ZoneInfo | timezone | None,
+        snapshots: bool,
+        origin: T,
+    ) -> IntervalHandler[T]:
+        handler = cls(tz=tz, snapshots=snapshots, origin=origin)
+        handler._assign_segments(segments)
+        return handler
+
+    def _assign_segments(self, segments: Iterable[tuple[T, T, float]]) -> None:
+        """Replaces the intervals with one interval for each of the consecutive `segments`, starting at the origin.
+
+        The projection graph is written directly, as the intervals are known not to overlap.
+        """
+        intervals = [Interval(start, end, value) for start, end, value in segments]
+        if not intervals:
+            self._initialize(self._tz)
+            return
+
+        resolve = None if self._snapshots else self.__active_intervals_at
+        nodes = [
+            TimeValueNode(
+                interval.start,
+                SortedList([interval]) if self._snapshots else None,
+                [interval],
+                [] if previous is None else [previous],
+                interval.value,
+                resolve,
+            )
+            for interval, previous in zip(intervals, [None, *intervals])
+        ]
+        nodes.append(
+            TimeValueNode(
+                intervals[-1].end,
+                SortedList() if self._snapshots else None,
+                [],
+                [intervals[-1]],
+                0.0,
+                resolve,
+            )
+        )
 
-    def _initialize(self, tz: ZoneInfo | timezone | None) -> None:
-        self.__intervals = list()
-        self.__projection_graph = SortedList([TimeValueNode(time_point=TIME_ZERO.replace(tzinfo=tz))])
+        self.__replace(intervals, nodes)
+
+    def _initialize(self, tz: ZoneInfo | timezone | None, intervals: Iterable[Interval[T]] = ()) -> None:
+        intervals = list(intervals)
+        self.__replace(
+            intervals,
+            _sweep(
+                intervals,
+                self._origin,
+                None if self._snapshots else self.__active_intervals_at,
+            ),
+        )
         self._tz = tz
 
+    def __replace(self, intervals: Iterable[Interval[T]], nodes: Iterable[TimeValueNode[T]]) -> None:
+        """Replaces the intervals and the graph in place, so that the views handed out before follow."""
+        self.__intervals.clear()
+        self.__intervals.update(intervals)
+        self.__projection_graph.clear()
+        self.__projection_graph.update(nodes)
+        self.__value_arrays = None
+        self.__version += 1
+        self.__interval_tree = None
+        self.__segment_tree = None
+        self.__changed(None, None)
+
     @property
-    def intervals(self) -> list[Interval]:
-        return list(self.__intervals)
+    def _nodes(self) -> SortedKeyList[TimeValueNode[T], T]:
+        """The projection graph itself, for internal use without copying it."""
+        if self.__pending:
+            self.__flush()
+        return self.__projection_graph
 
-    def __add__(self, other: IntervalHandler) -> IntervalHandler:
+    @property
+    def _version(self) -> int:
+        """Changes whenever the projection graph does, including for changes held back by `batch`."""
+        if self.__pending:
+            self.__flush()
+        return self.__version
+
+    # Written out instead of generated by `dataclass`, which would read the graph without the
+    # changes held back by `batch`.
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        other = cast(IntervalHandler[T], other)
+        return (self.__intervals, self._nodes, self._tz) == (other.__intervals, other._nodes, other._tz)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__qualname__}(_IntervalHandler__intervals={self.__intervals!r}, "
+            f"_IntervalHandler__projection_graph={self._nodes!r}, _tz={self._tz!r}, _snapshots={self._snapshots!r})"
+        )
+
+    @property
+    def intervals(self) -> MultisetView[Interval[T]]:
+        return MultisetView(self.__intervals)
+
+    def __add__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
         return _operate(self, other, operand=operator.add)
 
-    def __iadd__(self, other: IntervalHandler) -> None:
-        simplified = _operate(self, other, operand=operator.add)
-        self._initialize(tz=self._tz)
-        self.add(intervals=simplified.intervals)
-        return None
+    def __radd__(self, other: float) -> IntervalHandler[T]:
+        return _operate(self, other, operand=_reflected(operator.add))
+
+    def __iadd__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
+        return _operate_in_place(self, other, operand=operator.add)
 
-    def __sub__(self, other: IntervalHandler) -> IntervalHandler:
+    def __sub__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
         return _operate(self, other, operand=operator.sub)
 
-    def __isub__(self, other: IntervalHandler) -> None:
-        simplified = _operate(self, other, operand=operator.sub)
-        self._initialize(tz=self._tz)
-        self.add(intervals=simplified.intervals)
-        return None
+    def __rsub__(self, other: float) -> IntervalHandler[T]:
+        return _operate(self, other, operand=_reflected(operator.sub))
+
+    def __isub__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
+        return _operate_in_place(self, other, operand=operator.sub)
 
-    def __mul__(self, other: IntervalHandler) -> IntervalHandler:
+    def __mul__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
         return _operate(self, other, operand=operator.mul)
 
-    def __imul__(self, other: IntervalHandler) -> None:
-        simplified = _operate(self, other, operand=operator.mul)
-        self._initialize(tz=self._tz)
-        self.add(intervals=simplified.intervals)
-        return None
+    def __rmul__(self, other: float) -> IntervalHandler[T]:
+        return _operate(self, other, operand=_reflected(operator.mul))
 
-    def __truediv__(self, other: IntervalHandler) -> IntervalHandler:
+    def __imul__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
+        return _operate_in_place(self, other, operand=operator.mul)
+
+    def __truediv__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
         return _operate(self, other, operand=operator.truediv)
 
-    def __itruediv__(self, other: IntervalHandler) -> None:
-        simplified = _operate(self, other, operand=operator.truediv)
-        self._initialize(tz=self._tz)
-        self.add(intervals=simplified.intervals)
-        return None
+    def __rtruediv__(self, other: float) -> IntervalHandler[T]:
+        return _operate(self, other, operand=_reflected(operator.truediv))
+
+    def __itruediv__(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
+        return _operate_in_place(self, other, operand=operator.truediv)
+
+    def minimum(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
+        """The smaller of the values of the handler and `other` at each time point, up to the last one.
+
+        Like the other pointwise methods, consecutive segments of equal value are joined,
+        and the value is 0 from the last time point on, also for a scalar `other`.
+        """
+        return self._from_segments(_merged(_segments(self, other, min)), self._tz, self._snapshots, self._origin)
+
+    def maximum(self, other: IntervalHandler[T] | float) -> IntervalHandler[T]:
+        """The larger of the values of the handler and `other` at each time point, up to the last one.
+
+        The value is 0 from the last time point on, also for a scalar `other` above 0.
+        """
+        return self._from_segments(_merged(_segments(self, other, max)), self._tz, self._snapshots, self._origin)
+
+    def clip(self, lower: float | None = None, upper: float | None = None) -> IntervalHandler[T]:
+        """Limits the values to the range from `lower` to `upper`, either of which may be left open.
+
+        Like `apply`, this stops at the last time point, after which the value stays 0
+        even if it is out of the range.
+        """
+        if lower is not None and upper is not None and lower > upper:
+            raise ValueError(f"Lower bound {lower} is greater than upper bound {upper}.")
+        low = -math.inf if lower is None else lower
+        high = math.inf if upper is None else upper
+        return self.apply(lambda value: min(max(value, low), high))
+
+    def apply(self, fn: Callable[[float], float]) -> IntervalHandler[T]:
+        """Applies `fn` to the value of each segment, from the origin up to the last time point.
 
-    def add(self, intervals: Iterable[Interval]) -> None:
+        As for the operators, `fn` is not applied after the last time point, where the value stays 0.
+        """
+        return self._from_segments(_mapped(self, fn), self._tz, self._snapshots, self._origin)
+
+    @classmethod
+    def sum(cls, handlers: Iterable[IntervalHandler[T]]) -> IntervalHandler[T]:
+        """Adds up all `handlers` at once, in O(N log k) for N nodes in k handlers.
+
+        Gives the same values as chaining `+`, without building a handler for each partial sum.
+        """
+        handlers = _handlers(handlers, "sum")
+        return _combine(handlers, _sums(_changes([h._nodes for h in handlers]), len(handlers)))
+
+    @classmethod
+    def aggregate(
+        cls, handlers: Iterable[IntervalHandler[T]], fn: Callable[[Sequence[float]], float]
+    ) -> IntervalHandler[T]:
+        """Combines all `handlers` at once with `fn`, which receives the value of each handler at every time point.
+
+        The graphs are merged in O(N log k) for N nodes in k handlers, and `fn` is called once per time point.
+        """
+        handlers = _handlers(handlers, getattr(fn, "__name__", "aggregate"))
+        return _combine(handlers, _aggregates(_changes([h._nodes for h in handlers]), len(handlers), fn))
+
+    def add(self, intervals: Iterable[Interval[T]]) -> None:
         """Adds without simplifying the intervals."""
-        self.__intervals.extend(intervals)
+        if self._batching:
+            for interval in intervals:
+                _check_origin(interval, self._origin)
+                self.__intervals[interval] += 1
+                self.__pending[interval] += 1
+            return
+        low: T | None = None
+        high: T | None = None
         for interval in intervals:
+            _check_origin(interval, self._origin)
+            self.__intervals[interval] += 1
+            if self.__interval_tree is not None:
+                self.__interval_tree.add(interval)
+            if self.__segment_tree is not None:
+                self.__segment_tree.add(interval.start, interval.end, interval.value)
             _make_range(self.__projection_graph, interval)
             for node in _relevant_nodes(self.__projection_graph, interval):
                 node._add_interval(interval)
-                self._try_refresh_first_negative_point(node)
-
-    def remove(self, intervals: Collection[Interval]) -> None:
-        """Removes without simplifying the intervals."""
-        self.__intervals = [i for i in self.__intervals if i not in intervals]
-
-        for interval in intervals:
-            for node in _relevant_nodes(self.__projection_graph, interval):
+            low = interval.start if low is None or interval.start < low else low
+            high = interval.end if high is None or high < interval.end else high
+        self.__value_arrays = None
+        self.__version += 1
+        if low is not None and high is not None:
+            self.__settle(low, high)
+            self.__changed(low, high)
+
+    def remove(self, intervals: Collection[Interval[T]]) -> None:
+        """Removes one occurrence of each of the intervals.
+
+        Only the nodes at the bounds of the removed intervals are simplified,
+        so the cost is O(m (log n + k)) instead of rebuilding the graph.
+        """
+        to_remove = Counter(intervals)
+        for interval, count in to_remove.items():
+            if self.__intervals[interval] < count:
+                raise ValueError(f"{interval} is not in the handler.")
+
+        if self._batching:
+            self.__intervals -= to_remove
+            self.__pending.subtract(to_remove)
+            return
+
+        bounds = {}
+        for interval in to_remove.elements():
+            self.__intervals[interval] -= 1
+            if not self.__intervals[interval]:
+                del self.__intervals[interval]
+            if self.__interval_tree is not None:
+                self.__interval_tree.remove(interval)
+            if self.__segment_tree is not None:
+                self.__segment_tree.remove(interval.start, interval.end, interval.value)
+            relevant = _relevant_nodes(self.__projection_graph, interval)
+            for node in relevant:
                 node._remove_interval(interval)
-                self._try_refresh_first_negative_point(node)
-
-        self.__projection_graph = SortedList(_simplify(self.__projection_graph))
-        if self.__first_negative is None:
-            self.__first_negative = next((n for n in self.__projection_graph if n.value < 0), None)
-
-    def clone(self) -> IntervalHandler:
-        cloned = IntervalHandler(tz=self._tz)
-        cloned.__intervals = list(self.__intervals)
-        cloned.__projection_graph = SortedList(TimeValueNode.clone(given=node) for node in self.__projection_graph)
-        cloned.__first_negative = (
-            None
-            if self.__first_negative is None
-            else cloned.__projection_graph[self.__projection_graph.index(self.__first_negative)]
-        )
+            bounds[relevant[0].time_point] = relevant[0]
+            bounds[relevant[-1].time_point] = relevant[-1]
+
+        for node in bounds.values():
+            if node.is_redundant() and node.time_point != self._origin:
+                del self.__projection_graph[self.__projection_graph.bisect_key_left(node.time_point)]
+        self.__value_arrays = None
+        self.__version += 1
+        if bounds:
+            self.__settle(min(bounds), max(bounds))
+            self.__changed(min(bounds), max(bounds))
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Holds back the graph updates of `add` and `remove` until the end of the block.
+
+        The changes are then applied at once, with a single sweep over the range they touch.
+        Queries within the block apply the changes made so far first, so the handler
+        always ends up the same as without batching.
+        """
+        self._batching += 1
+        try:
+            yield
+        finally:
+            self._batching -= 1
+            if not self._batching and self.__pending:
+                self.__flush()
+
+    def __flush(self) -> None:
+        changes = {interval: delta for interval, delta in self.__pending.items() if delta}
+        self.__pending = Counter()
+        if not changes:
+            return
+
+        for interval, delta in changes.items():
+            for _ in range(abs(delta)):
+                if self.__interval_tree is not None:
+                    (self.__interval_tree.add if delta > 0 else self.__interval_tree.remove)(interval)
+                if self.__segment_tree is not None:
+                    (self.__segment_tree.add if delta > 0 else self.__segment_tree.remove)(
+                        interval.start, interval.end, interval.value
+                    )
+
+        # Outside of the changed range, the graph stays the same.
+        low, high = min(i.start for i in changes), max(i.end for i in changes)
+        touching = self.__tree().touching(low, high)
+        nodes = [
+            node
+            for node in _sweep(touching, self._origin, None if self._snapshots else self.__active_intervals_at)
+            if low <= node.time_point <= high
+        ]
+        graph = self.__projection_graph
+        first, stop = graph.bisect_key_left(low), graph.bisect_key_right(high)
+        del graph[first:stop]
+        graph.update(nodes)
+        self.__value_arrays = None
+        self.__version += 1
+        self.__settle(low, high)
+        self.__changed(low, high)
+
+    def __settle(self, low: T, high: T) -> None:
+        """Aligns the segment tree with the values of the graph from `low` to `high`.
+
+        The tree sums the values in another order, so that they could round differently.
+        """
+        if self.__segment_tree is not None:
+            self.__segment_tree.settle((n.time_point, n.value) for n in self.__projection_graph.irange_key(low, high))
+
+    def _subscribe(self, subscriber: LazyHandler[Any]) -> None:
+        """Reports the range of every later change to `subscriber`, for as long as it is alive.
+
+        Each `add` or `remove`, batch and replacement of the contents is reported once,
+        when the graph is up to date again.
+        """
+        self.__subscribers.add(subscriber)
+
+    def __changed(self, low: T | None, high: T | None) -> None:
+        """Reports a change from `low` to `high` to the subscribers, or of the whole axis if they are `None`."""
+        for subscriber in self.__subscribers:
+            subscriber._changed(low, high)
+
+    def _reaggregate(
+        self,
+        handlers: Sequence[IntervalHandler[T]],
+        fn: Callable[[Sequence[float]], float],
+        low: T | None = None,
+        high: T | None = None,
+    ) -> None:
+        """Updates the handler built by `aggregate(handlers, fn)` after the handlers changed from `low` to `high`.
+
+        Only the segments around the changed range are replaced, in O(k log n) for k segments.
+        Without a range, all of them are, in place too.
+        """
+        if low is None or high is None:
+            values = _aggregates(_changes([handler._nodes for handler in handlers]), len(handlers), fn)
+            self._assign_segments((start, end, value) for (start, value), (end, _) in more_itertools.pairwise(values))
+            return
+
+        nodes = self._nodes
+        # The time points before `low` and after `high` are still those of the handlers,
+        # so the segments from the last one before `low` up to the first one after `high` cover the change.
+        first, stop = max(nodes.bisect_key_left(low) - 1, 0), nodes.bisect_key_right(high)
+        start = nodes[first].time_point
+        end = nodes[stop].time_point if stop < len(nodes) else None
+        replaced = [interval for node in nodes.islice(first, stop) for interval in node.starting_intervals]
+
+        graphs = []
+        for handler in handlers:
+            graph = handler._nodes
+            last = len(graph) if end is None else graph.bisect_key_right(end)
+            graphs.append(graph.islice(_active_index(graph, start), last))
+        values = _aggregates(_clamped(_changes(graphs), start), len(handlers), fn)
+
+        self.remove(replaced)
+        self.add(Interval(start, end, value) for (start, value), (end, _) in more_itertools.pairwise(values))
+
+    def clone(self) -> IntervalHandler[T]:
+        cloned = IntervalHandler(tz=self._tz, snapshots=self._snapshots, origin=self._origin)
+        cloned.__intervals = Counter(self.__intervals)
+        cloned.__projection_graph = _graph(TimeValueNode.clone(given=node) for node in self._nodes)
+        if not self._snapshots:
+            for node in cloned.__projection_graph:
+                node._resolve = cloned.__active_intervals_at
         return cloned
 
-    def _try_refresh_first_negative_point(self, node: TimeValueNode) -> None:
-        if node.value < 0:
-            if self.__first_negative is None or node.time_point < self.__first_negative.time_point:
-                self.__first_negative = node
+    def __tree(self) -> IntervalTree[T]:
+        """The interval tree, built on first use and kept up to date by `add` and `remove` from then on."""
+        if self.__pending:
+            self.__flush()
+        if self.__interval_tree is None:
+            self.__interval_tree = IntervalTree(self.__intervals.elements())
+        return self.__interval_tree
+
+    def __segments(self) -> SegmentTree[T]:
+        """The projection graph as a `SegmentTree`, built on first use and kept up to date from then on."""
+        if self.__pending:
+            self.__flush()
+        if self.__segment_tree is None:
+            self.__segment_tree = SegmentTree._from_points(
+                self.__projection_graph[0].time_point,
+                [
+                    (n.time_point, n.value, len(n.starting_intervals) + len(n.ending_intervals))
+                    for n in self.__projection_graph
+                ],
+            )
+        return self.__segment_tree
+
+    def __active_intervals_at(self, when: T) -> SortedList[Interval[T]]:
+        return SortedList(self.__tree().stab(when))
 
-        if self.__first_negative and self.__first_negative.value >= 0:
-            self.__first_negative = None
+    def overlapping(self, during: Interval[T]) -> list[Interval[T]]:
+        """Returns the intervals overlapping with `during`, sorted, in O(log n + k).
+
+        Follows the same semantics as `overlaps`, also for degenerate intervals.
+        """
+        return self.__tree().overlapping(during)
+
+    def intervals_at(self, when: T) -> list[Interval[T]]:
+        """Returns the intervals containing `when`, sorted."""
+        if self._snapshots:
+            return [i for i in self.node_at_time(when).intervals if contains_point(i, when)]
+        else:
+            return self.__tree().stab(when)
 
     @property
-    def projection_graph(self) -> SortedList[TimeValueNode]:
-        return SortedList(self.__projection_graph)
+    def projection_graph(self) -> ProjectionGraphView[T]:
+        return ProjectionGraphView(self._nodes)
+
+    def node_at_time(self, when: T) -> TimeValueNode[T]:
+        return _active_node_at_time(self._nodes, when)
+
+    def value_at_time(self, when: T) -> float:
+        return _active_node_at_time(self._nodes, when).value
+
+    def nodes_at_times(self, times: Sequence[T]) -> list[TimeValueNode[T]]:
+        """Returns the node active at each of the sorted `times`.
+
+        The nodes between the first and the last of `times` are walked once alongside them,
+        in O(log n + k + m). When there are far more of those nodes than times, each time
+        is looked up on its own instead, in O(m log n).
+        """
+        if not times:
+            return []
+        nodes = self._nodes
+        first, stop = _active_index(nodes, times[0]), nodes.bisect_key_right(times[-1])
+        if stop - first > _NODES_PER_LOOKUP * len(times):
+            return [_active_node_at_time(nodes, when) for when in times]
+        return cast(
+            "list[TimeValueNode[T]]",
+            list(weak_predecessors(nodes.islice(first, stop), times, key=operator.attrgetter("time_point"))),
+        )
+
+    def cursor(self, start: T) -> Cursor[T]:
+        """Returns a `Cursor` at the node active at `start`, for looking up increasing time points."""
+        return Cursor(self, start)
+
+    def values_at(self, times: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """Returns the values at each of `times` with a single `searchsorted`, which requires numpy.
+
+        `times` is an array of `numpy.datetime64`, or of int64 microseconds since the Unix epoch.
+        For time zone aware handlers, they are on the wall clock of the handler's time zone,
+        like the time points of its projection graph, or in UTC if the graph mixes time zones
+        (see `tick_zone`). On other axes, `times` are plain numbers.
+        They do not need to be sorted.
+        """
+        import numpy as np
+
+        time_points, values = self.__arrays()
+        queried = np.asarray(times)
+        if np.issubdtype(queried.dtype, np.datetime64):
+            queried = queried.astype("datetime64[us]").view(np.int64)
+        indices = np.searchsorted(time_points, queried, side="right") - 1
+        if (indices < 0).any():
+            raise RuntimeError("Could not find active node at time.")
+        return values[indices]
+
+    def __arrays(self) -> tuple[npt.NDArray[np.int64 | np.float64], npt.NDArray[np.float64]]:
+        import numpy as np
+
+        # Applying the changes held back by `batch` clears the arrays too.
+        nodes = self._nodes
+        if self.__value_arrays is None:
+            zone = tick_zone(self._tz, (n.time_point for n in nodes))
+            self.__value_arrays = (
+                np.fromiter(
+                    (to_ticks(n.time_point, zone) for n in nodes),
+                    dtype=np.int64 if isinstance(self._origin, datetime) else np.float64,
+                    count=len(nodes),
+                ),
+                np.fromiter((n.value for n in nodes), dtype=np.float64, count=len(nodes)),
+            )
+        return self.__value_arrays
+
+    def __to_area(self, area: float) -> timedelta | float:
+        return area * TICK if isinstance(self._origin, datetime) else area
+
+    @overload
+    def get_area(self: IntervalHandler[datetime], during: Interval[datetime]) -> timedelta: ...
+
+    @overload
+    def get_area(self: IntervalHandler[int], during: Interval[int]) -> float: ...
+
+    @overload
+    def get_area(self: IntervalHandler[float], during: Interval[float]) -> float: ...
+
+    def get_area(self: IntervalHandler[Any], during: Interval[Any]) -> Any:
+        """Returns the area under the projection during the interval, scaled by its value, in O(log n).
+
+        The area is a `timedelta` on a `datetime` axis, and a number on numeric axes.
+        """
+        return self.__to_area(during.value * self.__segments().area(during.start, during.end))
+
+    @overload
+    def get_areas(self: IntervalHandler[datetime], windows: Iterable[Interval[datetime]]) -> list[timedelta]: ...
+
+    @overload
+    def get_areas(self: IntervalHandler[int], windows: Iterable[Interval[int]]) -> list[float]: ...
+
+    @overload
+    def get_areas(self: IntervalHandler[float], windows: Iterable[Interval[float]]) -> list[float]: ...
+
+    def get_areas(self: IntervalHandler[Any], windows: Iterable[Interval[Any]]) -> Any:
+        """Returns `get_area` for each of the windows, sharing a single index of the projection graph."""
+        segments = self.__segments()
+        return [self.__to_area(w.value * segments.area(w.start, w.end)) for w in windows]
+
+    def min_value(self, during: Interval[T]) -> float:
+        """Returns the lowest value of the projection during the interval, in O(log n)."""
+        return self.__segments().low(during.start, during.end)
+
+    def max_value(self, during: Interval[T]) -> float:
+        """Returns the highest value of the projection during the interval, in O(log n)."""
+        return self.__segments().high(during.start, during.end)
+
+    def earliest_fit(self, after: T, duration: timedelta | float, demand: float) -> T | None:
+        """Returns the earliest time, not before `after`, from which the value stays at least `demand` for `duration`.
+
+        Returns `None` if there is no such time.
+        """
+        return self.__segments().earliest_fit(after, duration, demand)
+
+    def latest_fit(self, before: T, duration: timedelta | float, demand: float) -> T | None:
+        """Returns the latest time from which the value stays at least `demand` for `duration`, until `before`.
 
-    def node_at_time(self, when: datetime) -> TimeValueNode:
-        return _active_node_at_time(self.__projection_graph, when)
+        Returns `None` if there is no such time.
+        """
+        return self.__segments().latest_fit(before, duration, demand)
 
-    def value_at_time(self, when: datetime) -> float:
-        return _active_node_at_time(self.__projection_graph, when).value
+    def first_below(self, threshold: float, after: T | None = None) -> T | None:
+        """Returns the earliest time, not before `after`, with a value below `threshold`, in O(log n)."""
+        return self.__segments().first_below(threshold, after)
 
-    def get_area(self, during: Interval) -> timedelta:
-        return _area_during_interval(self, during)
+    def first_above(self, threshold: float, after: T | None = None) -> T | None:
+        """Returns the earliest time, not before `after`, with a value above `threshold`, in O(log n)."""
+        return self.__segments().first_above(threshold, after)
 
     @property
-    def first_negative_point(self) -> TimeValueNode | None:
-        return self.__first_negative
+    def first_negative_point(self) -> TimeValueNode[T] | None:
+        when = self.first_below(0)
+        return None if when is None else self.node_at_time(when)
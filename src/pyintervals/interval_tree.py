@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Iterable
+from typing import Generic
+
+from .comparable import T
+from .interval import Interval, overlaps
+
+
+class _Node(Generic[T]):
+    """Owns `count` equal intervals, augmented with the latest end in its subtree."""
+
+    __slots__ = ("interval", "count", "max_end", "priority", "left", "right")
+
+    def __init__(self, interval: Interval[T], count: int = 1) -> None:
+        self.interval = interval
+        self.count = count
+        self.max_end = interval.end
+        self.priority = random.random()
+        self.left: _Node[T] | None = None
+        self.right: _Node[T] | None = None
+
+
+def _pull(node: _Node[T]) -> None:
+    node.max_end = node.interval.end
+    if node.left is not None and node.left.max_end > node.max_end:
+        node.max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > node.max_end:
+        node.max_end = node.right.max_end
+
+
+def _split(node: _Node[T] | None, interval: Interval[T], inclusive: bool) -> tuple[_Node[T] | None, _Node[T] | None]:
+    """Splits into intervals before `interval` (and equal to it, if `inclusive`) and the rest."""
+    if node is None:
+        return None, None
+    if node.interval < interval or (inclusive and node.interval == interval):
+        node.right, rest = _split(node.right, interval, inclusive)
+        _pull(node)
+        return node, rest
+    else:
+        before, node.left = _split(node.left, interval, inclusive)
+        _pull(node)
+        return before, node
+
+
+def _merge(left: _Node[T] | None, right: _Node[T] | None) -> _Node[T] | None:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _pull(left)
+        return left
+    else:
+        right.left = _merge(left, right.left)
+        _pull(right)
+        return right
+
+
+def _build(intervals: Iterable[Interval[T]]) -> _Node[T] | None:
+    """Builds the tree out of sorted intervals with a stack, in linear time."""
+    spine: list[_Node[T]] = []
+    for interval, count in Counter(intervals).items():
+        node = _Node(interval, count)
+        last = None
+        while spine and spine[-1].priority < node.priority:
+            last = spine.pop()
+            _pull(last)
+        node.left = last
+        if spine:
+            spine[-1].right = node
+        spine.append(node)
+    for node in reversed(spine):
+        _pull(node)
+    return spine[0] if spine else None
+
+
+def _collect(node: _Node[T] | None, during: Interval[T], found: list[Interval[T]]) -> None:
+    # Intervals ending before `during` cannot overlap, nor can the ones starting after it.
+    if node is None or node.max_end < during.start:
+        return
+    _collect(node.left, during, found)
+    if node.interval.start <= during.end:
+        if overlaps(node.interval, during):
+            found.extend([node.interval] * node.count)
+        _collect(node.right, during, found)
+
+
+def _touch(node: _Node[T] | None, start: T, end: T, found: list[Interval[T]]) -> None:
+    if node is None or node.max_end < start:
+        return
+    _touch(node.left, start, end, found)
+    if node.interval.start <= end:
+        if start <= node.interval.end:
+            found.extend([node.interval] * node.count)
+        _touch(node.right, start, end, found)
+
+
+class IntervalTree(Generic[T]):
+    """Intervals kept sorted in a treap, where each node knows the latest end in its subtree.
+
+    Finding the intervals overlapping with a timespan takes O(log n + k) time,
+    as whole subtrees ending before the timespan are skipped.
+    """
+
+    def __init__(self, intervals: Iterable[Interval[T]] = ()) -> None:
+        self._root = _build(sorted(intervals))
+
+    def add(self, interval: Interval[T]) -> None:
+        left, rest = _split(self._root, interval, inclusive=False)
+        node, right = _split(rest, interval, inclusive=True)
+        if node is None:
+            node = _Node(interval)
+        else:
+            node.count += 1
+        self._root = _merge(_merge(left, node), right)
+
+    def remove(self, interval: Interval[T]) -> None:
+        left, rest = _split(self._root, interval, inclusive=False)
+        node, right = _split(rest, interval, inclusive=True)
+        if node is None:
+            self._root = _merge(left, right)
+            raise ValueError(f"{interval} is not in the tree.")
+        node.count -= 1
+        self._root = _merge(_merge(left, node if node.count else None), right)
+
+    def overlapping(self, during: Interval[T]) -> list[Interval[T]]:
+        """Returns the intervals overlapping with `during`, in sorted order."""
+        found: list[Interval[T]] = []
+        _collect(self._root, during, found)
+        return found
+
+    def touching(self, start: T, end: T) -> list[Interval[T]]:
+        """Returns the intervals sharing at least a point with `start` until `end`, both included, in sorted order.
+
+        Unlike `overlapping`, this includes the intervals ending at `start` or starting at `end`.
+        """
+        found: list[Interval[T]] = []
+        _touch(self._root, start, end, found)
+        return found
+
+    def stab(self, when: T) -> list[Interval[T]]:
+        """Returns the intervals containing `when`, in sorted order."""
+        return self.overlapping(Interval(when, when))
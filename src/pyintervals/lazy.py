@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable, Sequence
+from typing import Any, Generic, cast
+
+from .comparable import T
+from .interval_handler import IntervalHandler
+
+_Operand = Callable[[float, float], float]
+
+
+class LazyHandler(Generic[T]):
+    """Arithmetic on handlers, recorded as an expression and evaluated when first queried.
+
+    Operators on `IntervalHandler`s build a whole handler for every intermediate result.
+    Once one of the handlers is wrapped in a `LazyHandler`, the operators build an expression
+    instead. It is evaluated in a single sweep over the change points of all the handlers in it,
+    and only for the expressions that are queried. Queries are answered by the resulting
+    `IntervalHandler`, which is kept up to date as the handlers in the expression change:
+    every `add` or `remove` on them evaluates the expression again over the time range it
+    touched only. The resulting handler is therefore not to be modified.
+    """
+
+    __slots__ = ("_handler", "_operand", "_operands", "_program", "_result", "__weakref__")
+
+    def __init__(self, handler: IntervalHandler[T]) -> None:
+        self._handler: IntervalHandler[T] | None = handler
+        self._operand: _Operand | None = None
+        self._operands: tuple[LazyHandler[T], ...] = ()
+        self._program: tuple[list[IntervalHandler[T]], Callable[[Sequence[float]], float]] | None = None
+        self._result: IntervalHandler[T] | None = None
+
+    @classmethod
+    def _apply(
+        cls,
+        operand: _Operand,
+        a: LazyHandler[T] | IntervalHandler[T],
+        b: LazyHandler[T] | IntervalHandler[T],
+    ) -> LazyHandler[T]:
+        operands = []
+        for x in (a, b):
+            if isinstance(x, IntervalHandler):
+                x = cls(x)
+            elif not isinstance(x, LazyHandler):
+                raise TypeError(f"unsupported operand type(s) for {operand.__name__}: " f"'{type(a)}' and '{type(b)}'")
+            operands.append(x)
+        expression: LazyHandler[T] = cls.__new__(cls)
+        expression._handler = None
+        expression._operand = operand
+        expression._operands = (operands[0], operands[1])
+        expression._program = None
+        expression._result = None
+        return expression
+
+    def __add__(self, other: LazyHandler[T] | IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.add, self, other)
+
+    def __radd__(self, other: IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.add, other, self)
+
+    def __sub__(self, other: LazyHandler[T] | IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.sub, self, other)
+
+    def __rsub__(self, other: IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.sub, other, self)
+
+    def __mul__(self, other: LazyHandler[T] | IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.mul, self, other)
+
+    def __rmul__(self, other: IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.mul, other, self)
+
+    def __truediv__(self, other: LazyHandler[T] | IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.truediv, self, other)
+
+    def __rtruediv__(self, other: IntervalHandler[T]) -> LazyHandler[T]:
+        return self._apply(operator.truediv, other, self)
+
+    def __compile(self) -> tuple[list[IntervalHandler[T]], Callable[[Sequence[float]], float]]:
+        """Flattens the expression into steps over numbered registers, one per handler and per operator.
+
+        Handlers and subexpressions appearing more than once get a single register,
+        so that they are evaluated once per time point.
+        """
+        handlers: list[IntervalHandler[T]] = []
+        handler_registers: list[int] = []
+        steps: list[tuple[int, _Operand, int, int]] = []
+        numbers: dict[int, int] = {}
+
+        def visit(expression: LazyHandler[T]) -> int:
+            key = id(expression._handler) if expression._handler is not None else id(expression)
+            if key not in numbers:
+                if expression._handler is not None:
+                    handlers.append(expression._handler)
+                    handler_registers.append(len(numbers))
+                else:
+                    left, right = (visit(operand) for operand in expression._operands)
+                    steps.append((len(numbers), cast(_Operand, expression._operand), left, right))
+                numbers[key] = len(numbers)
+            return numbers[key]
+
+        result = visit(self)
+        size = len(numbers)
+
+        def evaluate(values: Sequence[float]) -> float:
+            registers = [0.0] * size
+            for register, value in zip(handler_registers, values):
+                registers[register] = value
+            for register, operand, left, right in steps:
+                registers[register] = operand(registers[left], registers[right])
+            return registers[result]
+
+        return handlers, evaluate
+
+    def _changed(self, low: T | None, high: T | None) -> None:
+        """Called by the handlers in the expression with the range of each of their changes."""
+        if self._result is not None and self._program is not None:
+            handlers, evaluate = self._program
+            self._result._reaggregate(handlers, evaluate, low, high)
+
+    def materialize(self) -> IntervalHandler[T]:
+        """Returns the `IntervalHandler` the expression evaluates to, evaluating it on the first call only."""
+        if self._program is None:
+            self._program = self.__compile()
+        handlers, evaluate = self._program
+        for handler in handlers:
+            # Applies the changes held back by `batch`, which report their range here.
+            handler._nodes
+        if self._result is None:
+            self._result = IntervalHandler.aggregate(handlers, evaluate)
+            # The handlers only refer to the expression weakly, so the result keeps it alive.
+            self._result._expression = self
+            for handler in handlers:
+                handler._subscribe(self)
+        return self._result
+
+    def __getattr__(self, name: str) -> Any:
+        # Queries such as `value_at_time` or `get_area` are answered by the evaluated handler.
+        return getattr(self.materialize(), name)
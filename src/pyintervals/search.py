@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from bisect import bisect_left
-from typing import TYPE_CHECKING, Sequence, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence, TypeVar, Union
 
 if TYPE_CHECKING:
     from _typeshed import SupportsRichComparisonT
 
+E = TypeVar("E")
+
+_END: Any = object()
+
 
 def weak_predecessor(
     sorted_sequence: Sequence[SupportsRichComparisonT], point: SupportsRichComparisonT
@@ -32,3 +36,23 @@ def weak_predecessor(
 
     # Otherwise, we found the correct point
     return current
+
+
+def weak_predecessors(
+    sorted_elements: Iterable[E], sorted_points: Iterable[SupportsRichComparisonT], key: Callable[[E], Any]
+) -> Iterator[Union[E, None]]:
+    """Yields the weak predecessor of each of the sorted points, comparing the `key` of the elements with them.
+
+    Both are walked once side by side, in O(n + m), instead of searching for each point on its own.
+    """
+    elements = iter(sorted_elements)
+    predecessor: Union[E, None] = None
+    upcoming = next(elements, _END)
+    previous: Union[SupportsRichComparisonT, None] = None
+    for point in sorted_points:
+        if previous is not None and point < previous:  # type: ignore[operator]
+            raise ValueError("The points are not sorted.")
+        while upcoming is not _END and not point < key(upcoming):
+            predecessor, upcoming = upcoming, next(elements, _END)
+        yield predecessor
+        previous = point
@@ -0,0 +1,526 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Generic, cast
+from zoneinfo import ZoneInfo
+
+from .comparable import T
+from .constants import TIME_ZERO
+from .interval import Interval
+from .ticks import duration_to_ticks, from_ticks, tick_zone, to_ticks
+from .views import MultisetView
+
+
+class _Node(Generic[T]):
+    """A change point of the projection, owning the segment up to the next change point.
+
+    Nodes are ordered by `tick`, their time point as a number (see `to_ticks`), while
+    `key` keeps the time point itself to hand it back. `length` is the duration of
+    the segment in ticks, zero for the last change point. `low` and `high` bound
+    the values in the subtree. `value`, `low`, `high` and `area` already include `lazy`,
+    which is pending only for the children.
+    """
+
+    __slots__ = (
+        "key",
+        "tick",
+        "value",
+        "low",
+        "high",
+        "lazy",
+        "count",
+        "length",
+        "span",
+        "area",
+        "priority",
+        "left",
+        "right",
+    )
+
+    def __init__(self, key: T, tick: float, value: float, length: float = 0) -> None:
+        self.key = key
+        self.tick = tick
+        self.value = value
+        self.low = value
+        self.high = value
+        self.lazy = 0.0
+        self.count = 0
+        self.length = length
+        self.span = length
+        self.area = value * length
+        self.priority = random.random()
+        self.left: _Node[T] | None = None
+        self.right: _Node[T] | None = None
+
+
+def _shift(node: _Node[T] | None, delta: float) -> None:
+    if node is not None:
+        node.value += delta
+        node.low += delta
+        node.high += delta
+        node.area += delta * node.span
+        node.lazy += delta
+
+
+def _push(node: _Node[T]) -> None:
+    if node.lazy:
+        _shift(node.left, node.lazy)
+        _shift(node.right, node.lazy)
+        node.lazy = 0.0
+
+
+def _pull(node: _Node[T]) -> None:
+    node.low = node.high = node.value
+    node.span = node.length
+    node.area = node.value * node.length
+    for child in (node.left, node.right):
+        if child is not None:
+            if child.low < node.low:
+                node.low = child.low
+            if child.high > node.high:
+                node.high = child.high
+            node.span += child.span
+            node.area += child.area
+
+
+def _last_path(node: _Node[T] | None) -> list[_Node[T]]:
+    """Returns the path down to the last node, pushing the pending values along the way."""
+    path = []
+    while node is not None:
+        _push(node)
+        path.append(node)
+        node = node.right
+    return path
+
+
+def _pull_path(path: list[_Node[T]]) -> None:
+    for node in reversed(path):
+        _pull(node)
+
+
+def _split(node: _Node[T] | None, tick: float, inclusive: bool) -> tuple[_Node[T] | None, _Node[T] | None]:
+    """Splits into ticks before `tick` (and `tick` itself, if `inclusive`) and the rest."""
+    if node is None:
+        return None, None
+    _push(node)
+    if node.tick < tick or (inclusive and node.tick == tick):
+        node.right, rest = _split(node.right, tick, inclusive)
+        _pull(node)
+        return node, rest
+    else:
+        before, node.left = _split(node.left, tick, inclusive)
+        _pull(node)
+        return before, node
+
+
+def _merge(left: _Node[T] | None, right: _Node[T] | None) -> _Node[T] | None:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        _push(left)
+        left.right = _merge(left.right, right)
+        _pull(left)
+        return left
+    else:
+        _push(right)
+        right.left = _merge(left, right.left)
+        _pull(right)
+        return right
+
+
+def _lowest(node: _Node[T]) -> float:
+    return node.low
+
+
+def _highest(node: _Node[T]) -> float:
+    return node.high
+
+
+def _first(
+    node: _Node[T] | None,
+    acc: float,
+    after: float,
+    matches: Callable[[float], bool],
+    bound: Callable[[_Node[T]], float],
+) -> _Node[T] | None:
+    """Finds the first node with a tick later than `after` whose value `matches`.
+
+    Subtrees are skipped whenever their `bound` does not match, so `bound` has to be
+    the lowest value for upper thresholds and the highest one for lower thresholds.
+    """
+    if node is None or not matches(bound(node) + acc):
+        return None
+    if node.tick > after:
+        if found := _first(node.left, acc + node.lazy, after, matches, bound):
+            return found
+        if matches(node.value + acc):
+            return node
+    return _first(node.right, acc + node.lazy, after, matches, bound)
+
+
+def _last(
+    node: _Node[T] | None,
+    acc: float,
+    before: float,
+    matches: Callable[[float], bool],
+    bound: Callable[[_Node[T]], float],
+) -> _Node[T] | None:
+    """Finds the last node with a tick earlier than `before` whose value `matches`, like `_first`."""
+    if node is None or not matches(bound(node) + acc):
+        return None
+    if node.tick < before:
+        if found := _last(node.right, acc + node.lazy, before, matches, bound):
+            return found
+        if matches(node.value + acc):
+            return node
+    return _last(node.left, acc + node.lazy, before, matches, bound)
+
+
+class SegmentTree(Generic[T]):
+    """Piecewise constant projection over time with lazy range-add.
+
+    The leaves are the compressed change points, i.e. only the times at which
+    the value changes. The tree is balanced as a treap, so that unseen
+    coordinates can be inserted without rebuilding it. Adding a value over a
+    time range, looking up the value at a time and finding the first time
+    below or above a threshold all take O(log n), regardless of the range length.
+
+    Time points are converted to integer ticks once, when they enter the tree,
+    so that the tree itself only compares and subtracts plain integers.
+    """
+
+    def __init__(self, origin: T | None = None) -> None:
+        self._origin: T = cast(T, TIME_ZERO) if origin is None else origin
+        # Time zone aware time points are measured on the wall clock of the origin's time zone, or
+        # in UTC once they mix time zones, which orders them the way the projection graph does
+        # (see `tick_zone`).
+        self._measure_in(self._origin.tzinfo if isinstance(self._origin, datetime) else None)
+        self._root: _Node[T] | None = _Node(self._origin, self._origin_tick, 0.0)
+
+    def _measure_in(self, zone: tzinfo | None) -> None:
+        self._zone = zone
+        self._origin_tick = to_ticks(self._origin, zone)
+
+    @classmethod
+    def _from_points(cls, origin: T, points: Sequence[tuple[T, float, int]]) -> SegmentTree[T]:
+        """Builds the tree in linear time out of the sorted change points, starting at `origin`.
+
+        Each point is its time, the value from there on, and the number of interval bounds at it.
+        """
+        tree = cls(origin)
+        tree._measure_in(tick_zone(tree._zone, (key for key, _, _ in points)))
+        tree._build(points)
+        return tree
+
+    def _build(self, points: Sequence[tuple[T, float, int]]) -> None:
+        ticks = [to_ticks(key, self._zone) for key, _, _ in points]
+        spine: list[_Node[T]] = []
+        for (key, value, count), tick, following in zip(points, ticks, [*ticks[1:], None]):
+            node = _Node(key, tick, value, 0 if following is None else following - tick)
+            node.count = count
+            last = None
+            while spine and spine[-1].priority < node.priority:
+                last = spine.pop()
+                _pull(last)
+            node.left = last
+            if spine:
+                spine[-1].right = node
+            spine.append(node)
+        _pull_path(spine)
+        self._root = spine[0] if spine else self._root
+
+    def _points(self) -> Iterator[tuple[T, float, int]]:
+        """Iterates over the change points in chronological order, in the form `_from_points` takes."""
+        stack: list[tuple[_Node[T], float]] = []
+        node, acc = self._root, 0.0
+        while stack or node is not None:
+            while node is not None:
+                stack.append((node, acc))
+                acc += node.lazy
+                node = node.left
+            node, acc = stack.pop()
+            yield node.key, node.value + acc, node.count
+            acc += node.lazy
+            node = node.right
+
+    def _follow(self, *keys: T) -> None:
+        """Measures the tree in UTC from now on if `keys` are the first of another time zone."""
+        zone = tick_zone(self._zone, keys)
+        if zone is not self._zone:
+            points = list(self._points())
+            self._measure_in(zone)
+            self._build(sorted(points, key=lambda point: to_ticks(point[0], zone)))
+
+    def keys(self) -> Iterator[T]:
+        """Iterates over the change points in chronological order."""
+        stack: list[_Node[T]] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def _node_at(self, tick: float) -> tuple[_Node[T], float]:
+        """Returns the node with the latest tick not after `tick`, and the lazy value above it."""
+        node, acc = self._root, 0.0
+        found, found_acc = None, 0.0
+        while node is not None:
+            if node.tick <= tick:
+                found, found_acc = node, acc
+                if node.tick == tick:
+                    break
+                acc += node.lazy
+                node = node.right
+            else:
+                acc += node.lazy
+                node = node.left
+        if found is None:
+            raise RuntimeError("Could not find active node at time.")
+        return found, found_acc
+
+    def value_at(self, when: T) -> float:
+        node, acc = self._node_at(to_ticks(when, self._zone))
+        return node.value + acc
+
+    def _retain(self, key: T, tick: float) -> None:
+        node, acc = self._node_at(tick)
+        if node.tick != tick:
+            offset = tick - node.tick
+            new = _Node(key, tick, node.value + acc, node.length - offset if node.length else 0)
+            left, right = _split(self._root, tick, inclusive=False)
+            path = _last_path(left)
+            path[-1].length = offset
+            _pull_path(path)
+            self._root = _merge(_merge(left, new), right)
+            node = new
+        node.count += 1
+
+    def _release(self, key: T, tick: float) -> None:
+        node, _ = self._node_at(tick)
+        if node.tick != tick:
+            raise ValueError(f"No change point at {key}.")
+        node.count -= 1
+        if node.count == 0 and tick != self._origin_tick:
+            left, rest = _split(self._root, tick, inclusive=False)
+            _, right = _split(rest, tick, inclusive=True)
+            path = _last_path(left)
+            path[-1].length = path[-1].length + node.length if node.length else 0
+            _pull_path(path)
+            self._root = _merge(left, right)
+
+    def add(self, start: T, end: T, delta: float) -> None:
+        """Adds `delta` to the values in [`start`, `end`)."""
+        self._follow(start, end)
+        start_tick, end_tick = to_ticks(start, self._zone), to_ticks(end, self._zone)
+        self._retain(start, start_tick)
+        self._retain(end, end_tick)
+        left, rest = _split(self._root, start_tick, inclusive=False)
+        middle, right = _split(rest, end_tick, inclusive=False)
+        _shift(middle, delta)
+        self._root = _merge(_merge(left, middle), right)
+
+    def settle(self, points: Iterable[tuple[T, float]]) -> None:
+        """Overwrites the values at existing change points, in O(log n) each.
+
+        Range adds sum up the values in another order than a caller keeping its own values,
+        which this aligns the rounding of.
+        """
+        for key, value in points:
+            tick = to_ticks(key, self._zone)
+            left, rest = _split(self._root, tick, inclusive=False)
+            node, right = _split(rest, tick, inclusive=True)
+            if node is not None:
+                node.value = value
+                node.lazy = 0.0
+                _pull(node)
+            self._root = _merge(_merge(left, node), right)
+
+    def remove(self, start: T, end: T, delta: float) -> None:
+        """Reverts an earlier `add` of `delta` over [`start`, `end`)."""
+        start_tick, end_tick = to_ticks(start, self._zone), to_ticks(end, self._zone)
+        left, rest = _split(self._root, start_tick, inclusive=False)
+        middle, right = _split(rest, end_tick, inclusive=False)
+        _shift(middle, -delta)
+        self._root = _merge(_merge(left, middle), right)
+        self._release(start, start_tick)
+        self._release(end, end_tick)
+
+    def area(self, start: T, end: T) -> float:
+        """Returns the integral of the values over [`start`, `end`), in microseconds times value.
+
+        Only the change points within the range are summed, in O(log n).
+        """
+        start_tick, end_tick = to_ticks(start, self._zone), to_ticks(end, self._zone)
+        first, acc = self._node_at(start_tick)
+        first_value = first.value + acc
+
+        left, middle, right = self._cut(start_tick, end_tick, inclusive=True)
+        if middle is None:
+            area = first_value * (end_tick - start_tick)
+        else:
+            last = _last_path(middle)[-1]
+            area = (
+                first_value * (first.tick + first.length - start_tick)
+                + middle.area
+                + last.value * (end_tick - last.tick - last.length)
+            )
+        self._root = _merge(_merge(left, middle), right)
+        return area
+
+    def low(self, start: T, end: T) -> float:
+        """Returns the lowest value over [`start`, `end`), or at `start` if they are equal, in O(log n)."""
+        start_tick = to_ticks(start, self._zone)
+        node, acc = self._node_at(start_tick)
+        value = node.value + acc
+        left, middle, right = self._cut(start_tick, to_ticks(end, self._zone), inclusive=False)
+        if middle is not None:
+            value = min(value, middle.low)
+        self._root = _merge(_merge(left, middle), right)
+        return value
+
+    def high(self, start: T, end: T) -> float:
+        """Returns the highest value over [`start`, `end`), or at `start` if they are equal, in O(log n)."""
+        start_tick = to_ticks(start, self._zone)
+        node, acc = self._node_at(start_tick)
+        value = node.value + acc
+        left, middle, right = self._cut(start_tick, to_ticks(end, self._zone), inclusive=False)
+        if middle is not None:
+            value = max(value, middle.high)
+        self._root = _merge(_merge(left, middle), right)
+        return value
+
+    def _cut(
+        self, start: float, end: float, inclusive: bool
+    ) -> tuple[_Node[T] | None, _Node[T] | None, _Node[T] | None]:
+        """Splits the tree into the ticks up to `start`, the ones after it up to `end`, and the rest.
+
+        The caller merges them back.
+        """
+        left, rest = _split(self._root, start, inclusive=True)
+        middle, right = _split(rest, end, inclusive)
+        return left, middle, right
+
+    def first_below(self, threshold: float, after: T | None = None) -> T | None:
+        """Returns the earliest time, not before `after`, with a value below `threshold`."""
+        found = self._first_time(lambda value: value < threshold, _lowest, after)
+        return None if found is None else found[0]
+
+    def first_above(self, threshold: float, after: T | None = None) -> T | None:
+        """Returns the earliest time, not before `after`, with a value above `threshold`."""
+        found = self._first_time(lambda value: value > threshold, _highest, after)
+        return None if found is None else found[0]
+
+    def _first_time(
+        self,
+        matches: Callable[[float], bool],
+        bound: Callable[[_Node[T]], float],
+        after: T | None = None,
+        after_tick: float | None = None,
+    ) -> tuple[T, float] | None:
+        """Returns the earliest time, not before `after`, whose value `matches`, along with its tick."""
+        after = self._origin if after is None else after
+        after_tick = to_ticks(after, self._zone) if after_tick is None else after_tick
+        node, acc = self._node_at(after_tick)
+        if matches(node.value + acc):
+            return after, after_tick
+        found = _first(self._root, 0.0, after_tick, matches, bound)
+        return None if found is None else (found.key, found.tick)
+
+    def earliest_fit(self, after: T, duration: timedelta | float, demand: float) -> T | None:
+        """Returns the earliest time, not before `after`, from which the value stays at least `demand` for `duration`.
+
+        Each step jumps over a whole run of values below `demand`, or at least `demand`, in O(log n).
+        """
+        length = duration_to_ticks(duration)
+        start = self._first_time(lambda value: value >= demand, _highest, after)
+        while start is not None:
+            drop = self._first_time(lambda value: value < demand, _lowest, *start)
+            if drop is None or drop[1] - start[1] >= length:
+                return start[0]
+            start = self._first_time(lambda value: value >= demand, _highest, *drop)
+        return None
+
+    def latest_fit(self, before: T, duration: timedelta | float, demand: float) -> T | None:
+        """Returns the latest time from which the value stays at least `demand` for `duration`, until `before`.
+
+        The mirror image of `earliest_fit`. As the value has to reach `demand` at the start itself,
+        a zero `duration` fits at `before`, or else at the last change point before it with enough value.
+        """
+        length = duration_to_ticks(duration)
+        end = to_ticks(before, self._zone)
+        if not length:
+            node, acc = self._node_at(end)
+            if node.value + acc >= demand:
+                return before
+            rise = _last(self._root, 0.0, end, lambda value: value >= demand, _highest)
+            return None if rise is None else rise.key
+        while True:
+            drop = _last(self._root, 0.0, end, lambda value: value < demand, _lowest)
+            if drop is None:
+                break
+            recovery = drop.tick + drop.length if drop.length else end
+            if end - min(recovery, end) >= length:
+                break
+            rise = _last(self._root, 0.0, drop.tick, lambda value: value >= demand, _highest)
+            if rise is None:
+                return None
+            end = rise.tick + rise.length
+
+        if end - length < self._origin_tick:
+            return None
+        return from_ticks(end - length, self._origin, self._zone)
+
+
+class SegmentTreeHandler(Generic[T]):
+    """Alternative to `IntervalHandler`, backed by a `SegmentTree` instead of a node graph.
+
+    Adding or removing an interval costs O(log n) no matter how many change points
+    it spans, at the expense of not keeping the active intervals per time point.
+    """
+
+    def __init__(
+        self,
+        intervals: Iterable[Interval[T]] = [],
+        tz: ZoneInfo | timezone | None = None,
+        origin: T | None = None,
+    ):
+        self.__intervals: Counter[Interval[T]] = Counter()
+        self.__tree = SegmentTree(origin=cast(T, TIME_ZERO.replace(tzinfo=tz)) if origin is None else origin)
+        self._tz = tz
+        self.add(intervals)
+
+    @property
+    def intervals(self) -> MultisetView[Interval[T]]:
+        return MultisetView(self.__intervals)
+
+    def add(self, intervals: Iterable[Interval[T]]) -> None:
+        for interval in intervals:
+            self.__intervals[interval] += 1
+            if not interval.is_degenerate:
+                self.__tree.add(interval.start, interval.end, interval.value)
+
+    def remove(self, intervals: Collection[Interval[T]]) -> None:
+        # Copied, as `intervals` may be a view of the intervals being removed.
+        for interval in list(intervals):
+            if not self.__intervals[interval]:
+                raise ValueError(f"{interval} is not in the handler.")
+            self.__intervals[interval] -= 1
+            if not self.__intervals[interval]:
+                del self.__intervals[interval]
+            if not interval.is_degenerate:
+                self.__tree.remove(interval.start, interval.end, interval.value)
+
+    def value_at_time(self, when: T) -> float:
+        return self.__tree.value_at(when)
+
+    @property
+    def first_negative_point(self) -> T | None:
+        return self.__tree.first_below(0)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import cast
+
+from .comparable import Comparable, T
+
+TICK = timedelta(microseconds=1)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_ticks(time_point: Comparable, zone: tzinfo | None = None) -> float:
+    """Converts to a number on the axis of `time_point`.
+
+    `datetime`s become microseconds since the Unix epoch on their wall clock, after converting
+    time zone aware ones to `zone` if given. Python orders and subtracts datetimes of the same
+    time zone by their wall clock too, so that the ticks of a handler's time points keep the
+    order of its projection graph, also around daylight saving time changes (see `tick_zone`).
+    Numbers are their own ticks, so int and float axes skip the conversion.
+    """
+    if isinstance(time_point, datetime):
+        if zone is timezone.utc and time_point.tzinfo is not None:
+            # Subtracting the offset instead of converting also works at the ends of the datetime range.
+            return (time_point.replace(tzinfo=None) - _EPOCH - cast(timedelta, time_point.utcoffset())) // TICK
+        if zone is not None and time_point.tzinfo is not None:
+            time_point = time_point.astimezone(zone)
+        return (time_point.replace(tzinfo=None) - _EPOCH) // TICK
+    return cast(float, time_point)
+
+
+def from_ticks(ticks: float, like: T, zone: tzinfo | None = None) -> T:
+    """Converts a number back to a time point on the axis of `like`, in its time zone for `datetime`s.
+
+    `zone` is the time zone the ticks were measured in, if not that of `like`.
+    """
+    if isinstance(like, datetime):
+        time_point = (_EPOCH + ticks * TICK).replace(tzinfo=zone or like.tzinfo)
+        return cast(T, time_point if zone is None else time_point.astimezone(like.tzinfo))
+    return cast(T, ticks)
+
+
+def tick_zone(zone: tzinfo | None, time_points: Iterable[Comparable]) -> tzinfo | None:
+    """Returns the time zone to measure `time_points` in: `zone` while they all share it, and UTC otherwise.
+
+    Python orders datetimes of the same time zone by their wall clock, but datetimes of
+    different time zones by UTC, so that a projection graph mixing time zones is in UTC order.
+    """
+    if zone is None or zone is timezone.utc:
+        return zone
+    for time_point in time_points:
+        if isinstance(time_point, datetime) and time_point.tzinfo is not None and time_point.tzinfo is not zone:
+            return timezone.utc
+    return zone
+
+
+def duration_to_ticks(duration: timedelta | float) -> float:
+    """Converts a duration on an axis to a number, i.e. microseconds for `timedelta`s."""
+    return duration // TICK if isinstance(duration, timedelta) else duration
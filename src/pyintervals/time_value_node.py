@@ -1,48 +1,64 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass, field
-from datetime import datetime
 from itertools import chain, filterfalse
-from typing import Sequence
+from typing import Generic
 
-from sortedcontainers import SortedList
+from sortedcontainers import SortedKeyList, SortedList
 
-from pyintervals import Interval
-from pyintervals.constants import TIME_ZERO
-from pyintervals.interval import contains_point
+from pyintervals.comparable import T
+from pyintervals.interval import Interval, contains_point
+from pyintervals.views import SequenceView
 
 
 @dataclass
-class TimeValueNode:
-    time_point: datetime
-    __intervals: SortedList[Interval] = field(default_factory=SortedList)
-    __starting_intervals: list[Interval] = field(default_factory=list)
-    __ending_intervals: list[Interval] = field(default_factory=list)
+class TimeValueNode(Generic[T]):
+    """The value and intervals of a projection graph from `time_point` until the next node.
+
+    A node either keeps a snapshot of all its active intervals, or only the intervals
+    starting and ending at it. In the latter case, the snapshot is `None` and
+    the active intervals are looked up through `_resolve` when asked for.
+    """
+
+    time_point: T
+    __intervals: SortedList[Interval[T]] | None = field(default_factory=SortedList)
+    __starting_intervals: list[Interval[T]] = field(default_factory=list)
+    __ending_intervals: list[Interval[T]] = field(default_factory=list)
     __value: float = 0.0
+    _resolve: Callable[[T], SortedList[Interval[T]]] | None = field(default=None, repr=False)
 
     @property
-    def intervals(self) -> list[Interval]:
-        return list(self.__intervals)
+    def intervals(self) -> SequenceView[Interval[T]]:
+        return SequenceView(self.__active_intervals())
+
+    def __active_intervals(self) -> SortedList[Interval[T]]:
+        if self.__intervals is not None:
+            return self.__intervals
+        if self._resolve is None:
+            raise RuntimeError(f"Cannot resolve the active intervals at {self.time_point}.")
+        return self._resolve(self.time_point)
 
     @property
-    def starting_intervals(self) -> list[Interval]:
-        return list(self.__starting_intervals)
+    def starting_intervals(self) -> SequenceView[Interval[T]]:
+        return SequenceView(self.__starting_intervals)
 
     @property
-    def ending_intervals(self) -> list[Interval]:
-        return list(self.__ending_intervals)
+    def ending_intervals(self) -> SequenceView[Interval[T]]:
+        return SequenceView(self.__ending_intervals)
 
     @property
     def value(self) -> float:
         return self.__value
 
     def is_redundant(self) -> bool:
-        return self.time_point > TIME_ZERO and not self.__starting_intervals and not self.__ending_intervals
+        """Whether no interval starts or ends at this node, so that it only repeats the previous one."""
+        return not self.__starting_intervals and not self.__ending_intervals
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, TimeValueNode):
             raise NotImplementedError
-        return self.time_point == other.time_point and self.__intervals == other.__intervals
+        return self.time_point == other.time_point and self.__active_intervals() == other.__active_intervals()
 
     def __ne__(self, other: object) -> bool:
         return not (self == other)
@@ -50,34 +66,40 @@ class TimeValueNode:
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, TimeValueNode):
             raise NotImplementedError
-        return self.time_point < other.time_point
+        time_point: T = other.time_point
+        return self.time_point < time_point
 
     def __le__(self, other: object) -> bool:
         if not isinstance(other, TimeValueNode):
             raise NotImplementedError
-        return self.time_point <= other.time_point
+        time_point: T = other.time_point
+        return self.time_point <= time_point
 
     def __gt__(self, other: object) -> bool:
         if not isinstance(other, TimeValueNode):
             raise NotImplementedError
-        return self.time_point > other.time_point
+        time_point: T = other.time_point
+        return self.time_point > time_point
 
     def __ge__(self, other: object) -> bool:
         if not isinstance(other, TimeValueNode):
             raise NotImplementedError
-        return self.time_point >= other.time_point
+        time_point: T = other.time_point
+        return self.time_point >= time_point
 
-    def __add(self, interval: Interval) -> None:
-        self.__intervals.add(interval)
+    def __add(self, interval: Interval[T]) -> None:
+        if self.__intervals is not None:
+            self.__intervals.add(interval)
         if not interval.is_degenerate:
             self.__value += interval.value
 
-    def __remove(self, interval: Interval) -> None:
-        self.__intervals.remove(interval)
+    def __remove(self, interval: Interval[T]) -> None:
+        if self.__intervals is not None:
+            self.__intervals.remove(interval)
         if not interval.is_degenerate:
             self.__value -= interval.value
 
-    def _add_interval(self, interval: Interval) -> None:
+    def _add_interval(self, interval: Interval[T]) -> None:
         if interval.end == self.time_point:
             self.__ending_intervals.append(interval)
             if interval.is_degenerate:
@@ -88,7 +110,7 @@ class TimeValueNode:
         if interval.start == self.time_point:
             self.__starting_intervals.append(interval)
 
-    def _remove_interval(self, interval: Interval) -> None:
+    def _remove_interval(self, interval: Interval[T]) -> None:
         if contains_point(interval, self.time_point):
             self.__remove(interval)
         if interval.start == self.time_point:
@@ -96,9 +118,13 @@ class TimeValueNode:
         if interval.end == self.time_point:
             self.__ending_intervals.remove(interval)
 
-    def copy(self, to: datetime | None) -> TimeValueNode:
+    def copy(self, to: T | None) -> TimeValueNode[T]:
         if to is None or to == self.time_point:
             return TimeValueNode.clone(self)
+        elif self.__intervals is None:
+            # Every interval in the graph has nodes at its bounds, so there is
+            # nothing starting or ending at `to` to carry over.
+            return TimeValueNode(to, None, [], [], self.__value, self._resolve)
         else:
             return TimeValueNode(
                 to,
@@ -124,15 +150,30 @@ class TimeValueNode:
             )
 
     @staticmethod
-    def clone(given: TimeValueNode) -> TimeValueNode:
+    def clone(given: TimeValueNode[T]) -> TimeValueNode[T]:
         return TimeValueNode(
             given.time_point,
-            SortedList(given.__intervals),
+            None if given.__intervals is None else SortedList(given.__intervals),
             list(given.__starting_intervals),
             list(given.__ending_intervals),
             given.__value,
+            given._resolve,
         )
 
 
-def _simplify(nodes: Sequence[TimeValueNode]) -> list[TimeValueNode]:
-    return list(filterfalse(lambda n: n.is_redundant(), nodes))
+class ProjectionGraphView(SequenceView[TimeValueNode[T]]):
+    """A read-only view of a projection graph, whose nodes are sorted by their time points."""
+
+    __slots__ = ()
+    _items: SortedKeyList[TimeValueNode[T], T]
+
+    def __init__(self, nodes: SortedKeyList[TimeValueNode[T], T]) -> None:
+        super().__init__(nodes)
+
+    def bisect_left(self, when: T) -> int:
+        """Returns the index of the first node at or after `when`."""
+        return self._items.bisect_key_left(when)
+
+    def bisect_right(self, when: T) -> int:
+        """Returns the index of the first node after `when`, so that the node active at `when` precedes it."""
+        return self._items.bisect_key_right(when)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from itertools import islice, repeat
+from typing import Any, TypeVar, overload
+
+E = TypeVar("E")
+
+
+def _equal(view: Sequence[Any], other: object) -> bool:
+    if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+        return NotImplemented
+    return len(view) == len(other) and all(a == b for a, b in zip(view, other))
+
+
+class SequenceView(Sequence[E]):
+    """A read-only view of a sequence, which follows its changes without copying it.
+
+    Compares equal to any sequence with the same elements. Use `copy` for a snapshot.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Sequence[E]) -> None:
+        self._items = items
+
+    @overload
+    def __getitem__(self, index: int) -> E: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[E]: ...
+
+    def __getitem__(self, index: int | slice) -> E | list[E]:
+        if isinstance(index, slice):
+            return list(self._items[index])
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[E]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[E]:
+        return reversed(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._items
+
+    def __eq__(self, other: object) -> bool:
+        return _equal(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._items)!r})"
+
+    def copy(self) -> list[E]:
+        return list(self._items)
+
+
+class MultisetView(Sequence[E]):
+    """A read-only view of the elements of a `Counter`, repeated by their counts, in insertion order.
+
+    Membership and counting are O(1), while indexing walks the elements up to the index.
+    """
+
+    __slots__ = ("_counts",)
+
+    def __init__(self, counts: Counter[E]) -> None:
+        self._counts = counts
+
+    @overload
+    def __getitem__(self, index: int) -> E: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[E]: ...
+
+    def __getitem__(self, index: int | slice) -> E | list[E]:
+        if isinstance(index, slice):
+            return self.copy()[index]
+        position = index + len(self) if index < 0 else index
+        if position >= 0:
+            for element in islice(self._counts.elements(), position, None):
+                return element
+        raise IndexError(f"{type(self).__name__} index out of range")
+
+    def __len__(self) -> int:
+        return sum(self._counts.values())
+
+    def __iter__(self) -> Iterator[E]:
+        return self._counts.elements()
+
+    def __reversed__(self) -> Iterator[E]:
+        for element, count in reversed(self._counts.items()):
+            yield from repeat(element, count)
+
+    def __contains__(self, item: object) -> bool:
+        return self._counts.get(item, 0) > 0  # type: ignore[arg-type]
+
+    def count(self, value: Any) -> int:
+        return max(self._counts.get(value, 0), 0)
+
+    def index(self, value: Any, start: int = 0, stop: int | None = None) -> int:
+        """Returns the first index of `value` from `start` until `stop`, walking the distinct elements only."""
+        length = len(self)
+        start = max(start + length, 0) if start < 0 else start
+        stop = length if stop is None else stop + length if stop < 0 else stop
+        position = 0
+        for element, count in self._counts.items():
+            if count <= 0:
+                continue
+            if element == value:
+                found = max(position, start)
+                if found < min(position + count, stop):
+                    return found
+            position += count
+        raise ValueError(f"{value!r} is not in {type(self).__name__}")
+
+    def __eq__(self, other: object) -> bool:
+        return _equal(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.copy()!r})"
+
+    def copy(self) -> list[E]:
+        return list(self._counts.elements())
@@ -1,7 +1,27 @@
 from __future__ import annotations
 
-from datetime import datetime
+import random
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from pyintervals import Interval
 
 THE_DATE = datetime(2017, 5, 20, 12, 15)
 NOT_SO_IMPORTANT_LATER_DATE = datetime(2017, 5, 21, 10, 45)
 FUTURE_DATE = datetime(2023, 10, 29, 9, 5)
+
+
+def random_intervals(
+    rng: random.Random,
+    n: int,
+    hours: int = 24 * 30,
+    lengths: Sequence[int] = range(49),
+    values: Sequence[float] = range(-5, 6),
+    since: datetime = datetime(2023, 1, 1),
+) -> list[Interval]:
+    """Returns `n` intervals starting at one of the first `hours` hours `since`, lasting one of `lengths` hours."""
+    intervals = []
+    for _ in range(n):
+        start = since + timedelta(hours=rng.randrange(hours))
+        intervals.append(Interval(start, start + timedelta(hours=rng.choice(lengths)), value=rng.choice(values)))
+    return intervals
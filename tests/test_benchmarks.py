@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import operator
+from datetime import timedelta
+
+import pytest
+
+from pyintervals import Interval, IntervalHandler, LazyHandler
+from tests.helpers import THE_DATE
+
+# Benchmarks are disabled by default, run them with `pytest --benchmark-enable`.
+# The graph sizes differ by orders of magnitude, while the queried range stays the same.
+pytestmark = pytest.mark.slow
+
+GRAPH_SIZES = [1_000, 10_000, 100_000]
+
+
+def _shifts(n: int) -> list[Interval]:
+    return [
+        Interval(
+            THE_DATE + timedelta(hours=i),
+            THE_DATE + timedelta(hours=i + 8),
+            value=1,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module", params=GRAPH_SIZES)
+def large_handler(request: pytest.FixtureRequest) -> IntervalHandler:
+    return IntervalHandler.from_intervals(_shifts(request.param))
+
+
+def test_benchmark_add_early_interval(benchmark, large_handler: IntervalHandler) -> None:
+    interval = Interval(THE_DATE + timedelta(hours=2), THE_DATE + timedelta(hours=5), value=1)
+    benchmark(large_handler.add, [interval])
+    assert large_handler.node_at_time(interval.start).value >= 3
+
+
+def test_benchmark_get_area_early_interval(benchmark, large_handler: IntervalHandler) -> None:
+    during = Interval(THE_DATE, THE_DATE + timedelta(hours=24), value=1)
+    area = benchmark(large_handler.get_area, during)
+    assert area > timedelta(0)
+
+
+def test_benchmark_remove_batch(benchmark, large_handler: IntervalHandler) -> None:
+    batch = [
+        Interval(THE_DATE + timedelta(hours=i), THE_DATE + timedelta(hours=i, minutes=30), value=-1)
+        for i in range(0, 1_000, 10)
+    ]
+    benchmark.pedantic(large_handler.remove, args=(batch,), setup=lambda: large_handler.add(batch), rounds=20)
+    assert large_handler.first_negative_point is None
+
+
+def test_benchmark_subtract_handlers(benchmark, large_handler: IntervalHandler) -> None:
+    demand = IntervalHandler.from_intervals(
+        Interval(THE_DATE + timedelta(hours=i), THE_DATE + timedelta(hours=i + 1), value=1) for i in range(0, 1_000, 2)
+    )
+    net = benchmark(operator.sub, large_handler, demand)
+    assert net.value_at_time(THE_DATE) == 0
+
+
+def test_benchmark_earliest_fit(benchmark, large_handler: IntervalHandler) -> None:
+    start = benchmark(large_handler.earliest_fit, THE_DATE, timedelta(hours=24), 8)
+    assert start == THE_DATE + timedelta(hours=7)
+
+
+def test_benchmark_value_at_time(benchmark, large_handler: IntervalHandler) -> None:
+    value = benchmark(large_handler.value_at_time, THE_DATE + timedelta(hours=500, minutes=30))
+    assert value == 8
+
+
+def test_benchmark_batch_overlapping_adds(benchmark, large_handler: IntervalHandler) -> None:
+    batch = [Interval(THE_DATE + timedelta(hours=i), THE_DATE + timedelta(hours=i + 200), value=1) for i in range(200)]
+
+    def add_in_batch() -> None:
+        with large_handler.batch():
+            large_handler.add(batch)
+
+    def remove_batch() -> None:
+        if batch[0] in large_handler.intervals:
+            large_handler.remove(batch)
+
+    benchmark.pedantic(add_in_batch, setup=remove_batch, rounds=5)
+    assert large_handler.value_at_time(THE_DATE + timedelta(hours=300)) == 8 + 99
+    remove_batch()
+
+
+def test_benchmark_lazy_net_after_reservation(benchmark, large_handler: IntervalHandler) -> None:
+    demand = IntervalHandler.from_intervals(
+        Interval(THE_DATE + timedelta(hours=i), THE_DATE + timedelta(hours=i + 1), value=1) for i in range(0, 1_000, 2)
+    )
+    net = LazyHandler(large_handler) - demand
+    net.materialize()
+    reservation = Interval(THE_DATE + timedelta(hours=500), THE_DATE + timedelta(hours=502), value=1)
+
+    def reserve() -> float:
+        demand.add([reservation])
+        return net.value_at_time(reservation.start)
+
+    def cancel() -> None:
+        if reservation in demand.intervals:
+            demand.remove([reservation])
+
+    benchmark.pedantic(reserve, setup=cancel, rounds=20)
+    assert net.materialize() == large_handler - demand
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import pickle
+from dataclasses import FrozenInstanceError
 from datetime import datetime, timedelta
 
 import pytest
@@ -34,6 +36,37 @@ def test_invalid_interval():
         )
 
 
+def test_interval_is_frozen(regular_interval):
+    with pytest.raises(FrozenInstanceError):
+        regular_interval.value = 2
+    assert not hasattr(regular_interval, "__dict__")
+    assert pickle.loads(pickle.dumps(regular_interval)) == regular_interval
+    assert repr(regular_interval) == f"Interval(start={THE_DATE!r}, end={FUTURE_DATE!r}, value=1)"
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        Interval(THE_DATE, FUTURE_DATE, value=1),
+        Interval(THE_DATE, FUTURE_DATE, value=0),
+        Interval(THE_DATE, FUTURE_DATE, value=2),
+        Interval(THE_DATE, THE_DATE, value=5),
+        Interval(THE_DATE - timedelta(days=1), FUTURE_DATE),
+        Interval(THE_DATE + timedelta(days=1), FUTURE_DATE, value=-1),
+    ],
+)
+def test_interval_ordering_follows_fields(regular_interval, other):
+    def key(interval):
+        return interval.start, interval.end, interval.value
+
+    assert (regular_interval == other) == (key(regular_interval) == key(other))
+    assert (regular_interval < other) == (key(regular_interval) < key(other))
+    assert (regular_interval <= other) == (key(regular_interval) <= key(other))
+    assert (regular_interval > other) == (key(regular_interval) > key(other))
+    assert (regular_interval >= other) == (key(regular_interval) >= key(other))
+    assert (hash(regular_interval) == hash(other)) == (regular_interval == other)
+
+
 def test_valid_interval(regular_interval):
     assert regular_interval
     assert regular_interval.value == 1
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime
+import math
+import random
+from datetime import datetime, timedelta, timezone
 from typing import Callable, Iterable, Sequence
 
 import pytest
@@ -9,9 +11,10 @@ from sortedcontainers import SortedList
 
 from pyintervals import Interval
 from pyintervals.constants import TIME_ZERO
-from pyintervals.interval import contains_point
-from pyintervals.interval_handler import IntervalHandler, _make_range
+from pyintervals.interval import contains_point, overlaps
+from pyintervals.interval_handler import IntervalHandler, _graph, _make_range
 from pyintervals.time_value_node import TimeValueNode
+from tests.helpers import random_intervals
 
 
 @pytest.mark.parametrize(
@@ -313,6 +316,7 @@ def test_remove_intervals(
     ],
 )
 def test_make_range(nodes: SortedList, new_interval: Interval) -> None:
+    nodes = _graph(nodes)
     _make_range(nodes, new_interval)
     assert {new_interval.start, new_interval.end}.issubset({n.time_point for n in nodes})
 
@@ -402,6 +406,245 @@ def test_node_and_value_at_time(time_point, n_expected_intervals, expected_value
     assert handler.value_at_time(time_point) == expected_value
 
 
+@pytest.mark.parametrize(
+    "intervals",
+    [
+        [],
+        _complex_intervals(),
+        list(reversed(_complex_intervals())),
+        [
+            Interval(TIME_ZERO, datetime(2023, 1, 10), value=-1),
+            Interval(datetime(2023, 1, 5), datetime(2023, 1, 15), value=3),
+            Interval(datetime(2023, 1, 5), datetime(2023, 1, 15), value=3),
+            Interval(datetime(2023, 1, 15), datetime(2023, 1, 15), value=4),
+            Interval(datetime(2023, 1, 15), datetime(2023, 1, 20), value=-8),
+        ],
+    ],
+)
+def test_from_intervals_matches_add(intervals: list[Interval]) -> None:
+    added: IntervalHandler[datetime] = IntervalHandler()
+    for interval in intervals:
+        added.add([interval])
+    loaded = IntervalHandler.from_intervals(iter(intervals))
+
+    assert loaded == added
+    assert loaded.intervals == intervals
+    assert len(loaded.projection_graph) == len(added.projection_graph)
+    for loaded_node, added_node in zip(loaded.projection_graph, added.projection_graph):
+        assert loaded_node.value == added_node.value
+        assert loaded_node.starting_intervals == added_node.starting_intervals
+        assert loaded_node.ending_intervals == added_node.ending_intervals
+
+
+def test_from_intervals_matches_add_with_float_values() -> None:
+    rng = random.Random(0)
+    intervals = random_intervals(rng, 2000, hours=2000, lengths=range(1, 101), values=[0.1, 0.2, 0.3, 0.7])
+    added: IntervalHandler[datetime] = IntervalHandler()
+    for interval in intervals:
+        added.add([interval])
+    loaded = IntervalHandler.from_intervals(intervals)
+
+    assert loaded.first_negative_point is None
+    assert added.first_negative_point is None
+    assert loaded.projection_graph[-1].value == 0.0
+    assert len(loaded.projection_graph) == len(added.projection_graph)
+    for loaded_node, added_node in zip(loaded.projection_graph, added.projection_graph):
+        expected = math.fsum(interval.value for interval in loaded_node.intervals if not interval.is_degenerate)
+        assert loaded_node.value == pytest.approx(expected, rel=1e-12, abs=1e-12)
+        assert loaded_node.value == pytest.approx(added_node.value, rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize(
+    "to_add, to_remove",
+    [
+        ([], []),
+        ([Interval(datetime(2023, 1, 3), datetime(2023, 1, 21, 5), value=-4)], []),
+        ([], [_complex_intervals()[1], _complex_intervals()[2]]),
+        (
+            [Interval(datetime(2023, 1, 20, 5), datetime(2023, 1, 20, 5), value=1)],
+            _complex_intervals()[3:6],
+        ),
+    ],
+)
+def test_handler_without_snapshots(to_add: list[Interval], to_remove: list[Interval]) -> None:
+    with_snapshots = _complex_interval_handler()
+    without_snapshots = IntervalHandler(intervals=_complex_intervals(), snapshots=False)
+    for handler in (with_snapshots, without_snapshots):
+        handler.add(to_add)
+        handler.remove(to_remove)
+
+    assert without_snapshots == with_snapshots
+    graph = with_snapshots.projection_graph
+    delta_graph = without_snapshots.clone().projection_graph
+    assert len(delta_graph) == len(graph)
+    for delta_node, node in zip(delta_graph, graph):
+        assert delta_node.intervals == node.intervals
+        assert delta_node.starting_intervals == node.starting_intervals
+        assert delta_node.ending_intervals == node.ending_intervals
+        assert delta_node.value == node.value
+    for node in graph:
+        assert without_snapshots.intervals_at(node.time_point) == with_snapshots.intervals_at(node.time_point)
+
+
+@pytest.mark.parametrize(
+    "when, expected",
+    [
+        (datetime(2020, 1, 1), []),
+        (datetime(2023, 1, 15, 17), []),
+        (datetime(2023, 1, 20, 5), [_complex_intervals()[1], _complex_intervals()[2], _complex_intervals()[3]]),
+        (datetime(2023, 1, 20, 6), [_complex_intervals()[1], _complex_intervals()[3]]),
+        (datetime(2023, 1, 25, 5), [_complex_intervals()[4]]),
+        (datetime(2023, 1, 25, 6), []),
+    ],
+)
+@pytest.mark.parametrize("snapshots", [True, False])
+def test_intervals_at(when: datetime, expected: list[Interval], snapshots: bool) -> None:
+    handler = IntervalHandler(intervals=_complex_intervals(), snapshots=snapshots)
+    assert handler.intervals_at(when) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    "to_add, to_remove",
+    [
+        ([], []),
+        ([Interval(datetime(2023, 1, 10), datetime(2023, 2, 10), value=-4)], []),
+        ([], [_complex_intervals()[1], _complex_intervals()[6]]),
+        (
+            [Interval(datetime(2023, 1, 20, 5), datetime(2023, 1, 22), value=0.5)],
+            [_complex_intervals()[3], _complex_intervals()[4]],
+        ),
+    ],
+)
+def test_get_area_after_changes(to_add: list[Interval], to_remove: list[Interval]) -> None:
+    windows = [
+        Interval(datetime(2022, 12, 1), datetime(2023, 1, 10)),
+        Interval(datetime(2023, 1, 20, 5), datetime(2023, 1, 20, 5)),
+        Interval(datetime(2023, 1, 19), datetime(2023, 1, 25, 5), value=2),
+        Interval(datetime(2023, 1, 21, 12), datetime(2023, 3, 15), value=-1),
+    ]
+    handler = _complex_interval_handler()
+    handler.get_areas(windows)
+    handler.add(to_add)
+    handler.remove(to_remove)
+
+    rebuilt = IntervalHandler(handler.intervals)
+    expected = [
+        sum(
+            (
+                w.value * node.value * (min(w.end, end.time_point) - max(w.start, node.time_point))
+                for node, end in zip(rebuilt.projection_graph, rebuilt.projection_graph[1:])
+                if node.time_point < w.end and w.start < end.time_point
+            ),
+            start=timedelta(0),
+        )
+        for w in windows
+    ]
+    assert handler.get_areas(windows) == expected
+    assert [handler.get_area(w) for w in windows] == expected
+
+
+@pytest.mark.parametrize(
+    "during, expected_min, expected_max",
+    [
+        (Interval(datetime(2020, 1, 1), datetime(2023, 1, 1)), 0, 0),
+        (Interval(datetime(2020, 1, 1), datetime(2023, 1, 2)), 0, 1),
+        (Interval(datetime(2023, 1, 20, 5), datetime(2023, 1, 20, 5)), 7, 7),
+        (Interval(datetime(2023, 1, 19), datetime(2023, 1, 22)), 0, 7),
+        (Interval(datetime(2023, 1, 22), datetime(2023, 1, 25, 5)), 5, 5),
+        (Interval(datetime(2023, 1, 25, 5), datetime(2023, 3, 15)), 0, 3),
+    ],
+)
+def test_min_max_value(during: Interval, expected_min: float, expected_max: float) -> None:
+    handler = _complex_interval_handler()
+    assert handler.min_value(during) == expected_min
+    assert handler.max_value(during) == expected_max
+
+    handler.add([Interval(datetime(2019, 1, 1), datetime(2024, 1, 1), value=-2)])
+    assert handler.min_value(during) == expected_min - 2
+    assert handler.max_value(during) == expected_max - 2
+
+
+@pytest.mark.parametrize(
+    "threshold, after, below, above",
+    [
+        (0, None, None, datetime(2023, 1, 1)),
+        (1, None, TIME_ZERO, datetime(2023, 1, 19, 5)),
+        (3, datetime(2023, 1, 20), datetime(2023, 1, 20), datetime(2023, 1, 20, 5)),
+        (3, datetime(2023, 1, 21), datetime(2023, 1, 25, 5), datetime(2023, 1, 21)),
+        (3, datetime(2023, 1, 26), datetime(2023, 1, 26), None),
+        (7, datetime(2023, 1, 20, 6), datetime(2023, 1, 21, 23), None),
+    ],
+)
+def test_first_below_and_above(
+    threshold: float,
+    after: datetime | None,
+    below: datetime | None,
+    above: datetime | None,
+) -> None:
+    handler = _complex_interval_handler()
+    assert handler.first_below(threshold, after) == below
+    assert handler.first_above(threshold, after) == above
+
+
+@pytest.mark.parametrize(
+    "when, duration, demand, earliest, latest",
+    [
+        (datetime(2023, 1, 1), timedelta(days=1), 1, datetime(2023, 1, 1), None),
+        (datetime(2023, 1, 10), timedelta(days=3), 2, datetime(2023, 1, 19, 5), None),
+        (datetime(2023, 1, 22), timedelta(days=3), 5, datetime(2023, 1, 22), None),
+        (datetime(2023, 1, 22), timedelta(days=4), 5, None, None),
+        (datetime(2023, 1, 26), timedelta(days=3), 2, datetime(2023, 2, 1), datetime(2023, 1, 22, 5)),
+        (datetime(2023, 2, 20), timedelta(days=20), 3, None, None),
+        (datetime(2023, 2, 20), timedelta(days=20), 0, datetime(2023, 2, 20), datetime(2023, 1, 31)),
+        (datetime(2023, 1, 26), timedelta(0), 2, datetime(2023, 2, 1), datetime(2023, 1, 21, 23)),
+        (datetime(2023, 1, 26), timedelta(0), 9, None, None),
+        (datetime(2023, 2, 20), timedelta(0), 0, datetime(2023, 2, 20), datetime(2023, 2, 20)),
+    ],
+)
+def test_fits(
+    when: datetime,
+    duration: timedelta,
+    demand: float,
+    earliest: datetime | None,
+    latest: datetime | None,
+) -> None:
+    handler = _complex_interval_handler()
+    assert handler.earliest_fit(when, duration, demand) == earliest
+    assert handler.latest_fit(when, duration, demand) == latest
+
+
+def test_zero_duration_fits_need_the_demand_at_the_start() -> None:
+    handler = IntervalHandler([Interval(datetime(2023, 1, 1), datetime(2023, 1, 2), 1)])
+
+    assert handler.earliest_fit(datetime(2023, 1, 3), timedelta(0), 5) is None
+    assert handler.latest_fit(datetime(2023, 1, 3), timedelta(0), 5) is None
+    assert handler.latest_fit(datetime(2023, 1, 3), timedelta(0), 1) == datetime(2023, 1, 1)
+    assert handler.latest_fit(datetime(2023, 1, 1, 12), timedelta(0), 1) == datetime(2023, 1, 1, 12)
+
+
+@pytest.mark.parametrize(
+    "during",
+    [
+        Interval(datetime(2020, 1, 1), datetime(2020, 1, 1)),
+        Interval(datetime(2023, 1, 15, 17), datetime(2023, 1, 19, 5)),
+        Interval(datetime(2023, 1, 20, 5), datetime(2023, 1, 20, 5)),
+        Interval(datetime(2023, 1, 21), datetime(2023, 1, 25, 5)),
+        Interval(datetime(2023, 1, 25, 5), datetime(2023, 2, 1)),
+        Interval(datetime(2023, 1, 25, 5), datetime(2023, 2, 1, 1)),
+        Interval(datetime(2023, 1, 1), datetime(2023, 3, 1)),
+    ],
+)
+def test_overlapping(during: Interval) -> None:
+    handler = _complex_interval_handler()
+    assert handler.overlapping(during) == sorted(i for i in _complex_intervals() if overlaps(i, during))
+
+    added = Interval(datetime(2023, 1, 10), datetime(2023, 2, 10))
+    handler.add([added])
+    handler.remove([_complex_intervals()[3]])
+    expected = [i for i in _complex_intervals() + [added] if i != _complex_intervals()[3] and overlaps(i, during)]
+    assert handler.overlapping(during) == sorted(expected)
+
+
 @pytest.mark.parametrize(
     "intervals, n_expected_tvn_reduction",
     [
@@ -420,6 +663,46 @@ def test_remove_intervals_detailed(intervals: list[Interval], n_expected_tvn_red
     assert not any(interval in node.intervals for node in handler.projection_graph for interval in intervals)
 
 
+@pytest.mark.parametrize(
+    "to_remove",
+    [
+        [_complex_intervals()[1]],
+        [_complex_intervals()[1], _complex_intervals()[1]],
+        _complex_intervals()[::2],
+        [_complex_intervals()[0], _complex_intervals()[0]],
+        _complex_intervals(),
+    ],
+)
+def test_remove_matches_rebuild(to_remove: list[Interval]) -> None:
+    intervals = (
+        _complex_intervals()
+        + _complex_intervals()[:4]
+        + [
+            Interval(datetime(2023, 1, 19), datetime(2023, 1, 22), value=-10),
+        ]
+    )
+    handler = IntervalHandler(intervals=intervals)
+    handler.remove(to_remove)
+
+    remaining = list(intervals)
+    for interval in to_remove:
+        remaining.remove(interval)
+    rebuilt = IntervalHandler(intervals=remaining)
+    assert handler == rebuilt
+    assert sorted(handler.intervals) == sorted(remaining)
+    assert [n.value for n in handler.projection_graph] == [n.value for n in rebuilt.projection_graph]
+
+
+def test_remove_unknown_interval() -> None:
+    handler = _complex_interval_handler()
+    unknown = Interval(datetime(2023, 1, 1), datetime(2023, 1, 2))
+    with pytest.raises(ValueError):
+        handler.remove([_complex_intervals()[0], unknown])
+    with pytest.raises(ValueError):
+        handler.remove([_complex_intervals()[0], _complex_intervals()[0]])
+    assert handler == _complex_interval_handler()
+
+
 @pytest.mark.parametrize(
     "test_id,intervals,expected_time_point,expected_value_check,additional_assertions",
     [
@@ -933,6 +1216,15 @@ def test_first_negative_point_after_remove(
             [Interval(datetime(2023, 1, 8), datetime(2023, 1, 20), value=-10)],
             datetime(2023, 1, 8),
         ),
+        (
+            "add_positive_that_cancels_first_of_separate_negatives",
+            [
+                Interval(datetime(2023, 1, 1), datetime(2023, 1, 2), value=-1),
+                Interval(datetime(2023, 1, 3), datetime(2023, 1, 4), value=-1),
+            ],
+            [Interval(datetime(2023, 1, 1), datetime(2023, 1, 2), value=5)],
+            datetime(2023, 1, 3),
+        ),
     ],
     ids=[
         "add_negative_to_empty",
@@ -945,6 +1237,7 @@ def test_first_negative_point_after_remove(
         "add_positive_to_negative",
         "add_multiple_negatives",
         "add_negative_that_creates_first_negative",
+        "add_positive_that_cancels_first_of_separate_negatives",
     ],
 )
 def test_first_negative_point_after_add(
@@ -973,6 +1266,25 @@ def test_first_negative_point_after_add(
         )
 
 
+def test_first_negative_point_rounds_like_the_nodes() -> None:
+    def at(hours: int) -> datetime:
+        return datetime(2023, 1, 1, hours)
+
+    handler = IntervalHandler([Interval(at(3), at(5), -0.1)])
+    handler.first_negative_point
+    handler.add([Interval(at(0), at(2), -0.1)])
+    with handler.batch():
+        handler.add([Interval(at(2), at(4), -0.3), Interval(at(1), at(4), -0.3)])
+    with handler.batch():
+        handler.add([Interval(at(1), at(2), 0.3), Interval(at(0), at(1), 0.7)])
+    handler.remove([Interval(at(0), at(2), -0.1)])
+
+    first_negative = handler.first_negative_point
+    assert first_negative is not None and first_negative.value < 0
+    for node in handler.projection_graph:
+        assert handler.min_value(Interval(node.time_point, node.time_point)) == node.value
+
+
 @pytest.mark.parametrize(
     "test_id,intervals,tz",
     [
@@ -1213,3 +1525,207 @@ def test_clone_preserves_values(test_id: str, intervals: list[Interval], test_ti
         except RuntimeError:
             # If time point is out of range, both should fail
             pass
+
+
+@pytest.mark.parametrize("tz", [None, timezone(timedelta(hours=3))])
+def test_values_at(tz: timezone | None) -> None:
+    np = pytest.importorskip("numpy")
+    handler = IntervalHandler(
+        intervals=[
+            Interval(i.start.replace(tzinfo=tz), i.end.replace(tzinfo=tz), value=i.value) for i in _complex_intervals()
+        ],
+        tz=tz,
+    )
+    times = [
+        datetime(2023, 2, 15, tzinfo=tz),
+        datetime(2020, 1, 1, tzinfo=tz),
+        datetime(2023, 1, 20, 5, tzinfo=tz),
+        datetime(2023, 1, 20, 4, 59, tzinfo=tz),
+        datetime(2023, 3, 1, tzinfo=tz),
+        datetime(2023, 1, 1, tzinfo=tz),
+    ]
+    expected = [handler.value_at_time(t) for t in times]
+    as_wall_clock = np.array([t.replace(tzinfo=None) for t in times], "datetime64[us]")
+
+    assert handler.values_at(as_wall_clock).tolist() == expected
+    assert handler.values_at(as_wall_clock.astype("datetime64[s]")).tolist() == expected
+    assert handler.values_at(as_wall_clock.view(np.int64)).dtype == np.float64
+    assert handler.values_at(as_wall_clock.view(np.int64)).tolist() == expected
+
+    handler.add([Interval(datetime(2019, 1, 1, tzinfo=tz), datetime(2024, 1, 1, tzinfo=tz), value=10)])
+    assert handler.values_at(as_wall_clock).tolist() == [value + 10 for value in expected]
+
+    with pytest.raises(RuntimeError):
+        handler.values_at(np.array(["NaT"], "datetime64[us]"))
+
+
+@pytest.mark.parametrize("scale", [1, 0.5])
+@pytest.mark.parametrize("snapshots", [True, False])
+def test_numeric_axis(scale: float, snapshots: bool) -> None:
+    intervals = [
+        Interval(0 * scale, 10 * scale, value=2),
+        Interval(5 * scale, 15 * scale, value=1),
+        Interval(12 * scale, 12 * scale, value=4),
+    ]
+    handler = IntervalHandler(intervals, snapshots=snapshots, origin=0 * scale)
+
+    assert [node.time_point for node in handler.projection_graph] == [0, 5 * scale, 10 * scale, 12 * scale, 15 * scale]
+    assert [handler.value_at_time(t * scale) for t in (0, 5, 10, 12, 15)] == [2, 3, 1, 1, 0]
+    assert handler.intervals_at(12 * scale) == [intervals[1], intervals[2]]
+    assert handler.overlapping(Interval(11 * scale, 20 * scale)) == [intervals[1], intervals[2]]
+    assert handler.get_area(Interval(0, 20 * scale, value=1)) == 30 * scale
+    assert handler.get_areas([Interval(5 * scale, 10 * scale, value=2)]) == [30 * scale]
+    assert handler.min_value(Interval(0, 12 * scale)) == 1
+    assert handler.max_value(Interval(0, 12 * scale)) == 3
+    assert handler.earliest_fit(0, 5 * scale, 2) == 0
+    assert handler.earliest_fit(6 * scale, 5 * scale, 2) is None
+    assert handler.latest_fit(20 * scale, 10 * scale, 1) == 5 * scale
+    assert handler.first_below(2) == 10 * scale
+
+    handler.remove([intervals[0]])
+    assert handler == IntervalHandler(intervals[1:], origin=0 * scale)
+    assert handler.node_at_time(0).value == 0
+    assert (handler + handler.clone()).value_at_time(7 * scale) == 2
+
+
+def test_numeric_axis_values_at() -> None:
+    np = pytest.importorskip("numpy")
+    handler = IntervalHandler([Interval(0.0, 1.5, value=2), Interval(1.0, 3.0, value=1)], origin=0.0)
+    assert handler.values_at(np.array([0.5, 1.25, 2.0, 3.0])).tolist() == [2, 3, 1, 0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cursor_matches_node_at_time(seed: int) -> None:
+    rng = random.Random(seed)
+    handler = IntervalHandler(_complex_intervals())
+    times = sorted(datetime(2023, 1, 1) + timedelta(hours=rng.randrange(24 * 70)) for _ in range(200))
+    cursor = handler.cursor(times[0])
+    for i, when in enumerate(times):
+        if i == 100:
+            handler.add([Interval(when + timedelta(hours=1), when + timedelta(days=3), value=10)])
+        if i == 150:
+            handler.remove([handler.intervals[0]])
+        assert cursor.advance_to(when) is handler.node_at_time(when)
+        assert cursor.node is handler.node_at_time(when)
+
+    assert cursor.advance_to(times[0]) is handler.node_at_time(times[0])
+    with pytest.raises(RuntimeError):
+        IntervalHandler(origin=0).cursor(-1)
+
+
+def test_intervals_before_the_origin() -> None:
+    with pytest.raises(ValueError, match="before the origin"):
+        IntervalHandler([Interval(-5, 3, value=1)], origin=0)
+    handler = IntervalHandler([Interval(0, 3, value=1)], origin=0)
+    with pytest.raises(ValueError, match="before the origin"):
+        handler.add([Interval(-5, 3, value=1)])
+    with pytest.raises(ValueError, match="before the origin"), handler.batch():
+        handler.add([Interval(-5, 3, value=1)])
+    assert handler == IntervalHandler([Interval(0, 3, value=1)], origin=0)
+
+
+@pytest.mark.parametrize("n_times", [1, 2, 1_000])
+def test_nodes_at_times(n_times: int) -> None:
+    # Few times far apart are looked up one by one, while many are found in a single walk.
+    start = datetime(2023, 1, 1)
+    handler = IntervalHandler(
+        Interval(start + timedelta(hours=i), start + timedelta(hours=i + 5), value=i % 7) for i in range(1_000)
+    )
+    rng = random.Random(n_times)
+    times = sorted(start + timedelta(minutes=rng.randrange(60 * 1_100)) for _ in range(n_times))
+    assert handler.nodes_at_times(times) == [handler.node_at_time(when) for when in times]
+    assert handler.nodes_at_times([]) == []
+    with pytest.raises(RuntimeError):
+        IntervalHandler(origin=0).nodes_at_times([-1, 2])
+
+
+def _node_contents(handler: IntervalHandler) -> list[tuple]:
+    return [
+        (n.time_point, n.value, sorted(n.intervals), sorted(n.starting_intervals), sorted(n.ending_intervals))
+        for n in handler.projection_graph
+    ]
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("snapshots", [True, False])
+def test_batch_matches_unbatched(seed: int, snapshots: bool) -> None:
+    rng = random.Random(seed)
+    batched = IntervalHandler(_complex_intervals(), snapshots=snapshots)
+    unbatched = IntervalHandler(_complex_intervals(), snapshots=snapshots)
+    if seed % 2:
+        batched.overlapping(Interval(datetime(2023, 1, 1), datetime(2023, 2, 1)))
+        batched.get_area(Interval(datetime(2023, 1, 1), datetime(2023, 2, 1)))
+
+    with batched.batch():
+        for i in range(30):
+            if rng.random() < 0.3 and unbatched.intervals:
+                to_remove = [rng.choice(unbatched.intervals)]
+                batched.remove(to_remove)
+                unbatched.remove(to_remove)
+            else:
+                start = datetime(2023, 1, 1) + timedelta(hours=rng.randrange(24 * 60))
+                to_add = [
+                    Interval(start, start + timedelta(hours=rng.choice([0, 1, 24, 100])), value=rng.randint(-3, 3))
+                ]
+                batched.add(to_add)
+                unbatched.add(to_add)
+            if i == 20:
+                when = datetime(2023, 1, 20)
+                assert batched.value_at_time(when) == unbatched.value_at_time(when)
+
+    assert batched == unbatched
+    assert _node_contents(batched) == _node_contents(unbatched)
+    during = Interval(datetime(2023, 1, 1), datetime(2023, 3, 1), value=1)
+    assert batched.overlapping(during) == unbatched.overlapping(during)
+    assert batched.get_area(during) == unbatched.get_area(during)
+    assert batched.first_negative_point == unbatched.first_negative_point
+
+
+def test_values_at_within_batch() -> None:
+    np = pytest.importorskip("numpy")
+    handler = IntervalHandler(_complex_intervals())
+    when = datetime(2023, 1, 20)
+    handler.values_at(np.array([when], "datetime64[us]"))
+    with handler.batch():
+        handler.add([Interval(datetime(2023, 1, 1), datetime(2023, 2, 1), value=5)])
+        assert handler.values_at(np.array([when], "datetime64[us]")).tolist() == [handler.value_at_time(when)]
+        handler.remove([Interval(datetime(2023, 1, 1), datetime(2023, 2, 1), value=5)])
+        assert handler.values_at(np.array([when], "datetime64[us]")).tolist() == [handler.value_at_time(when)]
+
+
+def test_equality_and_repr_within_batch() -> None:
+    handler = IntervalHandler(_complex_intervals())
+    added = Interval(datetime(2023, 1, 1), datetime(2023, 2, 1), value=5)
+    expected = IntervalHandler([*_complex_intervals(), added])
+    with handler.batch():
+        handler.add([added])
+        assert handler == expected
+        within = repr(handler)
+    assert handler == expected
+    assert repr(handler) == within
+
+
+def test_batch_matches_unbatched_with_float_values() -> None:
+    rng = random.Random(0)
+    batched: IntervalHandler[datetime] = IntervalHandler()
+    unbatched: IntervalHandler[datetime] = IntervalHandler()
+    with batched.batch():
+        for interval in random_intervals(rng, 1000, hours=1000, lengths=range(1, 51), values=[0.1, 0.2, 0.7]):
+            batched.add([interval])
+            unbatched.add([interval])
+
+    assert batched.first_negative_point is None
+    assert batched.projection_graph[-1].value == 0.0
+    for batched_node, unbatched_node in zip(batched.projection_graph, unbatched.projection_graph):
+        assert batched_node.value == pytest.approx(unbatched_node.value, rel=1e-12, abs=1e-12)
+
+
+def test_batch_validates_removals() -> None:
+    handler = IntervalHandler(_complex_intervals())
+    interval = Interval(datetime(2023, 1, 1), datetime(2023, 1, 2), value=5)
+    with handler.batch():
+        handler.add([interval])
+        handler.remove([interval])
+        with pytest.raises(ValueError):
+            handler.remove([interval])
+    assert handler == IntervalHandler(_complex_intervals())
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import random
+from datetime import timedelta
+
+import pytest
+
+from pyintervals import Interval
+from pyintervals.interval import overlaps
+from pyintervals.interval_tree import IntervalTree
+from tests.helpers import THE_DATE
+
+
+def _random_intervals(n: int, rng: random.Random) -> list[Interval]:
+    intervals = []
+    for _ in range(n):
+        start = THE_DATE + timedelta(hours=rng.randint(0, 24))
+        intervals.append(Interval(start, start + timedelta(hours=rng.choice([0, 0, 1, 3, 12])), value=1))
+    return intervals
+
+
+def test_interval_tree_keeps_duplicates() -> None:
+    interval = Interval(THE_DATE, THE_DATE + timedelta(hours=1))
+    tree = IntervalTree([interval, interval])
+    assert tree.overlapping(interval) == [interval, interval]
+
+    tree.remove(interval)
+    assert tree.stab(THE_DATE) == [interval]
+
+    tree.remove(interval)
+    assert tree.stab(THE_DATE) == []
+    with pytest.raises(ValueError):
+        tree.remove(interval)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_interval_tree_matches_overlaps(seed: int) -> None:
+    rng = random.Random(seed)
+    owned = _random_intervals(30, rng)
+    tree = IntervalTree(owned[:15])
+    for interval in owned[15:]:
+        tree.add(interval)
+    for interval in rng.sample(owned, 10):
+        tree.remove(interval)
+        owned.remove(interval)
+
+    for during in _random_intervals(30, rng):
+        assert tree.overlapping(during) == sorted(i for i in owned if overlaps(i, during))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import gc
+import random
+from datetime import datetime
+
+import pytest
+
+from pyintervals import Interval, IntervalHandler, LazyHandler
+from pyintervals.constants import TIME_ZERO
+from tests.helpers import random_intervals
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lazy_matches_eager(seed: int) -> None:
+    rng = random.Random(seed)
+    supply, demand, efficiency, reserved = (IntervalHandler(random_intervals(rng, 10)) for _ in range(4))
+
+    lazy = (LazyHandler(supply) - demand) * efficiency - reserved
+    eager = (supply - demand) * efficiency - reserved
+    assert lazy.materialize() == eager
+    assert lazy.value_at_time(datetime(2023, 1, 15)) == eager.value_at_time(datetime(2023, 1, 15))
+    during = Interval(datetime(2023, 1, 1), datetime(2023, 2, 1), value=1)
+    assert lazy.get_area(during) == eager.get_area(during)
+
+    reflected = (supply - LazyHandler(demand)) * efficiency - reserved
+    assert reflected.materialize() == eager
+    assert (supply + LazyHandler(demand)).materialize() == supply + demand
+    halves = IntervalHandler([Interval(TIME_ZERO, datetime(2024, 1, 1), value=2)])
+    assert (efficiency / LazyHandler(halves)).materialize() == efficiency / halves
+
+    shared = LazyHandler(supply) - demand
+    assert (shared * shared + supply).materialize() == (supply - demand) * (supply - demand) + supply
+
+
+def test_lazy_follows_changes() -> None:
+    rng = random.Random(0)
+    supply, demand = IntervalHandler(random_intervals(rng, 10)), IntervalHandler(random_intervals(rng, 10))
+    net = LazyHandler(supply) - demand
+    first = net.materialize()
+    assert net.materialize() is first
+
+    reservation = Interval(datetime(2023, 1, 10), datetime(2023, 1, 12), value=3)
+    demand.add([reservation])
+    assert net.materialize() == supply - demand
+
+    with demand.batch():
+        demand.remove([reservation])
+        assert net.materialize() == supply - demand
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("snapshots", [True, False])
+def test_lazy_updates_only_the_changed_range(seed: int, snapshots: bool) -> None:
+    rng = random.Random(seed)
+    supply, demand, efficiency = (IntervalHandler(random_intervals(rng, 10), snapshots=snapshots) for _ in range(3))
+    net = (LazyHandler(supply) - demand) * efficiency
+    result = net.materialize()
+    for _ in range(20):
+        handler = rng.choice([supply, demand, efficiency])
+        if handler.intervals and rng.random() < 0.4:
+            handler.remove([rng.choice(handler.intervals.copy())])
+        else:
+            handler.add(random_intervals(rng, 2))
+        assert result == (supply - demand) * efficiency
+        assert net.materialize() is result
+
+    with supply.batch():
+        supply.add(random_intervals(rng, 10))
+    assert result == (supply - demand) * efficiency
+    demand *= efficiency
+    assert result == (supply - demand) * efficiency
+    assert net.materialize() is result
+
+
+def test_lazy_result_follows_changes_without_the_expression() -> None:
+    rng = random.Random(0)
+    supply, demand = IntervalHandler(random_intervals(rng, 10)), IntervalHandler(random_intervals(rng, 10))
+    net = (LazyHandler(supply) - demand).materialize()
+    gc.collect()
+
+    demand.add([Interval(datetime(2023, 1, 3), datetime(2023, 1, 4), value=2)])
+    assert net == supply - demand
+    assert net.value_at_time(datetime(2023, 1, 3)) == (supply - demand).value_at_time(datetime(2023, 1, 3))
+
+
+def test_lazy_operand_types() -> None:
+    with pytest.raises(TypeError):
+        LazyHandler(IntervalHandler[datetime]()) + 1  # type: ignore[operator]
+    with pytest.raises(TypeError):
+        IntervalHandler() - "1"  # type: ignore[operator]
+    with pytest.raises(TypeError):
+        "1" - LazyHandler(IntervalHandler())  # type: ignore[operator]
+    empty: IntervalHandler[datetime] = IntervalHandler()
+    assert (LazyHandler(empty) / empty).materialize() == empty / empty
+    with pytest.raises(ZeroDivisionError):
+        (
+            LazyHandler(IntervalHandler([Interval(datetime(2023, 1, 1), datetime(2023, 1, 2), value=1)])) / empty
+        ).materialize()
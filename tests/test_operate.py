@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import functools
 import operator
+import random
 from collections.abc import Callable
 from datetime import datetime, timedelta
 from typing import Any, Union
@@ -9,6 +11,7 @@ import pytest
 
 from pyintervals import Interval, IntervalHandler
 from pyintervals.constants import TIME_ZERO
+from tests.helpers import random_intervals
 
 T_NOW = datetime(2025, 1, 1)
 
@@ -995,8 +998,16 @@ def test_operate(
             with pytest.raises(expected_error_type):
                 in_place_operand(a, b)
         else:
-            in_place_operand(a, b)
-            assert a == expected
+            intervals = list(a.intervals)
+            assert in_place_operand(a, b) is a
+            assert expected is not None
+            if operand in (operator.add, operator.sub):
+                # The intervals are kept, along with the segments of `b` added to them.
+                assert all(interval in a.intervals for interval in intervals)
+                for node in [*a.projection_graph, *expected.projection_graph]:
+                    assert a.value_at_time(node.time_point) == expected.value_at_time(node.time_point)
+            else:
+                assert a == expected
     else:
         if expected_error_type is not None:
             with pytest.raises(expected_error_type):
@@ -1004,3 +1015,175 @@ def test_operate(
         else:
             result = operand(a, b)
             assert result == expected
+
+
+@pytest.mark.parametrize("snapshots", [True, False])
+@pytest.mark.parametrize("operand", [operator.add, operator.sub, operator.mul])
+def test_operate_matches_reference_handler(operand: Callable[[Any, Any], Any], snapshots: bool) -> None:
+    a = IntervalHandler(
+        intervals=[
+            Interval(T_NOW, T_NOW + timedelta(days=3), value=4),
+            Interval(T_NOW + timedelta(days=1), T_NOW + timedelta(days=5), value=-2),
+            Interval(T_NOW + timedelta(days=2), T_NOW + timedelta(days=2), value=7),
+        ],
+        snapshots=snapshots,
+    )
+    b = IntervalHandler(
+        intervals=[
+            Interval(T_NOW - timedelta(days=1), T_NOW + timedelta(days=1), value=3),
+            Interval(T_NOW + timedelta(days=5), T_NOW + timedelta(days=6), value=-1),
+        ],
+        snapshots=snapshots,
+    )
+    time_points = sorted({n.time_point for n in a.projection_graph} | {n.time_point for n in b.projection_graph})
+    reference = IntervalHandler(
+        intervals=[
+            Interval(start, end, value=operand(a.value_at_time(start), b.value_at_time(start)))
+            for start, end in zip(time_points, time_points[1:])
+        ]
+    )
+
+    result = operand(a, b)
+
+    assert result == reference
+    assert result.first_negative_point == reference.first_negative_point
+    for node, expected in zip(result.projection_graph, reference.projection_graph):
+        assert node.value == expected.value
+        assert node.starting_intervals == expected.starting_intervals
+        assert node.ending_intervals == expected.ending_intervals
+
+
+def test_in_place_addition_only_touches_the_other_handler_range() -> None:
+    handler = IntervalHandler(
+        intervals=[Interval(T_NOW + timedelta(days=i), T_NOW + timedelta(days=i + 2), value=i) for i in range(10)]
+    )
+    untouched = [node for node in handler.projection_graph if node.time_point > T_NOW + timedelta(days=4)]
+    owned = list(handler.intervals)
+    other = IntervalHandler(intervals=[Interval(T_NOW + timedelta(days=1), T_NOW + timedelta(days=3), value=5)])
+
+    handler += other
+    handler -= other + other
+
+    assert all(node is handler.node_at_time(node.time_point) for node in untouched)
+    assert handler.intervals == [
+        *owned,
+        Interval(T_NOW + timedelta(days=1), T_NOW + timedelta(days=3), value=5),
+        Interval(T_NOW + timedelta(days=1), T_NOW + timedelta(days=3), value=-10),
+    ]
+    assert handler.value_at_time(T_NOW + timedelta(days=2)) == 1 + 2 - 5
+
+
+def test_augmented_assignment_keeps_handler() -> None:
+    handler = IntervalHandler(intervals=[Interval(T_NOW, T_NOW + timedelta(days=3), value=4)])
+    original = handler
+
+    handler += handler
+    handler -= IntervalHandler(intervals=[Interval(T_NOW + timedelta(days=1), T_NOW + timedelta(days=2), value=10)])
+
+    assert handler is original
+    assert handler.value_at_time(T_NOW) == 8
+    assert handler.value_at_time(T_NOW + timedelta(days=1)) == -2
+    assert handler.first_negative_point is not None
+    assert handler.first_negative_point.time_point == T_NOW + timedelta(days=1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("k", [1, 2, 7])
+def test_sum_matches_chained_addition(seed: int, k: int) -> None:
+    rng = random.Random(seed)
+    handlers = [IntervalHandler(random_intervals(rng, 10)) for _ in range(k)]
+    expected = functools.reduce(operator.add, handlers, IntervalHandler[datetime]())
+    assert IntervalHandler.sum(handlers) == expected
+    assert IntervalHandler.aggregate(handlers, sum) == expected
+    highest = IntervalHandler.aggregate(handlers, max)
+    for node in expected.projection_graph:
+        assert highest.value_at_time(node.time_point) == max(h.value_at_time(node.time_point) for h in handlers)
+
+
+def test_sum_of_nothing() -> None:
+    assert IntervalHandler.sum([]) == IntervalHandler()
+    with pytest.raises(TypeError):
+        IntervalHandler.sum([IntervalHandler(), 1])  # type: ignore[arg-type]
+
+
+def _pointwise_handlers() -> tuple[IntervalHandler, IntervalHandler]:
+    a = IntervalHandler(
+        intervals=[
+            Interval(T_NOW, T_NOW + timedelta(days=3), value=4),
+            Interval(T_NOW + timedelta(days=1), T_NOW + timedelta(days=5), value=-2),
+            Interval(T_NOW + timedelta(days=5), T_NOW + timedelta(days=6), value=2),
+        ]
+    )
+    b = IntervalHandler(intervals=[Interval(T_NOW - timedelta(days=1), T_NOW + timedelta(days=2), value=3)])
+    return a, b
+
+
+@pytest.mark.parametrize(
+    "operation, expected",
+    [
+        (lambda h: h * 1.5, lambda v: v * 1.5),
+        (lambda h: 1.5 * h, lambda v: 1.5 * v),
+        (lambda h: h - 5, lambda v: v - 5),
+        (lambda h: 5 - h, lambda v: 5 - v),
+        (lambda h: h + 1, lambda v: v + 1),
+        (lambda h: h / 4, lambda v: v / 4),
+        (lambda h: h.clip(lower=0), lambda v: max(v, 0)),
+        (lambda h: h.clip(-1, 1), lambda v: min(max(v, -1), 1)),
+        (lambda h: h.apply(abs), abs),
+        (lambda h: h.maximum(0), lambda v: max(v, 0)),
+    ],
+)
+def test_pointwise_scalar_operations(
+    operation: Callable[[IntervalHandler], IntervalHandler], expected: Callable[[float], float]
+) -> None:
+    a, _ = _pointwise_handlers()
+    result = operation(a)
+    for node in a.projection_graph[:-1]:
+        assert result.value_at_time(node.time_point) == expected(node.value)
+    assert result.projection_graph[-1].time_point == a.projection_graph[-1].time_point
+    assert result.projection_graph[-1].value == 0
+    values = [node.value for node in result.projection_graph[:-1]]
+    assert all(value != following for value, following in zip(values, values[1:]))
+
+
+def test_pointwise_operations_stay_zero_after_the_last_time_point() -> None:
+    a, _ = _pointwise_handlers()
+    later = a.projection_graph[-1].time_point + timedelta(days=365)
+    assert a.clip(lower=2).value_at_time(later) == 0
+    assert a.maximum(3).value_at_time(later) == 0
+    assert (a + 5).value_at_time(later) == 0
+    assert (a - 5).value_at_time(T_NOW) == a.value_at_time(T_NOW) - 5
+    assert IntervalHandler[datetime]() + 5 == IntervalHandler()
+
+
+def test_pointwise_handler_operations() -> None:
+    a, b = _pointwise_handlers()
+    lowest, highest = a.minimum(b), a.maximum(b)
+    time_points = sorted({n.time_point for n in a.projection_graph} | {n.time_point for n in b.projection_graph})
+    for time_point in time_points[:-1]:
+        assert lowest.value_at_time(time_point) == min(a.value_at_time(time_point), b.value_at_time(time_point))
+        assert highest.value_at_time(time_point) == max(a.value_at_time(time_point), b.value_at_time(time_point))
+    assert highest.intervals == [
+        Interval(TIME_ZERO, T_NOW - timedelta(days=1), value=0),
+        Interval(T_NOW - timedelta(days=1), T_NOW, value=3),
+        Interval(T_NOW, T_NOW + timedelta(days=1), value=4),
+        Interval(T_NOW + timedelta(days=1), T_NOW + timedelta(days=2), value=3),
+        Interval(T_NOW + timedelta(days=2), T_NOW + timedelta(days=3), value=2),
+        Interval(T_NOW + timedelta(days=3), T_NOW + timedelta(days=5), value=0),
+        Interval(T_NOW + timedelta(days=5), T_NOW + timedelta(days=6), value=2),
+    ]
+
+
+def test_pointwise_operations_keep_handler_settings() -> None:
+    a, _ = _pointwise_handlers()
+    original = a
+    a *= 2
+    a -= 1
+    assert a is original
+    assert a.value_at_time(T_NOW) == 7
+    assert sum([a, a]) == 0 + a + a
+    assert IntervalHandler().apply(abs) == IntervalHandler()
+    with pytest.raises(ValueError):
+        a.clip(1, 0)
+    with pytest.raises(TypeError):
+        a.maximum("1")  # type: ignore[arg-type]
@@ -3,7 +3,7 @@ from __future__ import annotations
 import pytest
 from sortedcontainers import SortedList
 
-from pyintervals.search import weak_predecessor
+from pyintervals.search import weak_predecessor, weak_predecessors
 
 
 @pytest.mark.parametrize(
@@ -20,3 +20,23 @@ from pyintervals.search import weak_predecessor
 )
 def test_weak_predecessor(sequence, point, expected) -> None:
     assert weak_predecessor(SortedList(sequence), point) == expected
+
+
+@pytest.mark.parametrize(
+    "sequence, points",
+    [
+        ([], [0, 1]),
+        ([1, 2, 3, 4], []),
+        ([1, 2, 3, 4], [0, 1, 1.5, 1.5, 3, 4, 4.5]),
+        ([1, 3, 5], [2, 5, 6]),
+        ([1, 1, 2], [1, 2]),
+    ],
+)
+def test_weak_predecessors(sequence, points) -> None:
+    expected = [weak_predecessor(SortedList(sequence), point) for point in points]
+    assert list(weak_predecessors(sequence, points, key=lambda x: x)) == expected
+
+
+def test_weak_predecessors_of_unsorted_points() -> None:
+    with pytest.raises(ValueError):
+        list(weak_predecessors([1, 2, 3], [2, 1], key=lambda x: x))
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from pyintervals import Interval, IntervalHandler
+from pyintervals.constants import TIME_ZERO
+from pyintervals.segment_tree import SegmentTree, SegmentTreeHandler
+from tests.helpers import THE_DATE, random_intervals
+
+
+def test_segment_tree_add_and_remove() -> None:
+    tree: SegmentTree[datetime] = SegmentTree()
+    tree.add(datetime(2023, 1, 1), datetime(2023, 1, 10), 5)
+    tree.add(datetime(2023, 1, 5), datetime(2023, 1, 15), -8)
+
+    assert tree.value_at(TIME_ZERO) == 0
+    assert tree.value_at(datetime(2023, 1, 1)) == 5
+    assert tree.value_at(datetime(2023, 1, 5)) == -3
+    assert tree.value_at(datetime(2023, 1, 10)) == -8
+    assert tree.value_at(datetime(2023, 1, 15)) == 0
+    assert tree.first_below(0) == datetime(2023, 1, 5)
+    assert tree.first_below(0, after=datetime(2023, 1, 12)) == datetime(2023, 1, 12)
+    assert tree.first_below(0, after=datetime(2023, 1, 15)) is None
+    assert tree.first_below(-5) == datetime(2023, 1, 10)
+
+    tree.remove(datetime(2023, 1, 5), datetime(2023, 1, 15), -8)
+    assert list(tree.keys()) == [TIME_ZERO, datetime(2023, 1, 1), datetime(2023, 1, 10)]
+    assert tree.first_below(0) is None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_segment_tree_random_range_adds(seed: int) -> None:
+    rng = random.Random(seed)
+    tree: SegmentTree[datetime] = SegmentTree()
+    expected = [0] * 20
+    added = []
+    for _ in range(15):
+        start = rng.randint(0, 18)
+        end = rng.randint(start + 1, 19)
+        delta = rng.randint(-9, 9)
+        tree.add(THE_DATE + timedelta(hours=start), THE_DATE + timedelta(hours=end), delta)
+        added.append((start, end, delta))
+        for hour in range(start, end):
+            expected[hour] += delta
+        assert [tree.value_at(THE_DATE + timedelta(hours=hour)) for hour in range(20)] == expected
+
+    for start, end, delta in added[::2]:
+        tree.remove(THE_DATE + timedelta(hours=start), THE_DATE + timedelta(hours=end), delta)
+        for hour in range(start, end):
+            expected[hour] -= delta
+        assert [tree.value_at(THE_DATE + timedelta(hours=hour)) for hour in range(20)] == expected
+
+    hour = timedelta(hours=1) // timedelta(microseconds=1)
+    for start, end in [(0, 20), (3, 3), (2, 9), (5, 6)]:
+        assert tree.area(THE_DATE + timedelta(hours=start), THE_DATE + timedelta(hours=end)) == hour * sum(
+            expected[start:end]
+        )
+    assert (
+        tree.area(THE_DATE + timedelta(minutes=30), THE_DATE + timedelta(hours=1, minutes=30))
+        == hour * (expected[0] + expected[1]) / 2
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_segment_tree_fits(seed: int) -> None:
+    rng = random.Random(seed)
+    tree: SegmentTree[datetime] = SegmentTree()
+    values = [0] * 20
+    for _ in range(8):
+        start = rng.randint(0, 18)
+        end = rng.randint(start + 1, 19)
+        delta = rng.randint(-2, 6)
+        tree.add(THE_DATE + timedelta(hours=start), THE_DATE + timedelta(hours=end), delta)
+        for hour in range(start, end):
+            values[hour] += delta
+
+    def fits(start: int, duration: int, demand: int) -> bool:
+        return all((values[h] if 0 <= h < 20 else 0) >= demand for h in range(start, start + duration))
+
+    for _ in range(20):
+        duration, demand = rng.randint(1, 5), rng.randint(-1, 6)
+        after = rng.randint(0, 25)
+        earliest = next((h for h in range(after, 50) if fits(h, duration, demand)), None)
+        assert tree.earliest_fit(THE_DATE + timedelta(hours=after), timedelta(hours=duration), demand) == (
+            None if earliest is None else THE_DATE + timedelta(hours=earliest)
+        )
+
+        before = rng.randint(0, 25)
+        latest = next((h for h in range(before - duration, -50, -1) if fits(h, duration, demand)), None)
+        assert tree.latest_fit(THE_DATE + timedelta(hours=before), timedelta(hours=duration), demand) == (
+            None if latest is None else THE_DATE + timedelta(hours=latest)
+        )
+
+
+def test_segment_tree_measures_wall_clock_time_like_the_graph() -> None:
+    tz = ZoneInfo("Europe/Amsterdam")
+    tree = SegmentTree(origin=TIME_ZERO.replace(tzinfo=tz))
+    # Daylight saving time starts at 2 AM, while datetimes of the same time zone subtract by their wall clock.
+    start, end = datetime(2023, 3, 26, tzinfo=tz), datetime(2023, 3, 26, 6, tzinfo=tz)
+    tree.add(start, end, 1)
+
+    assert tree.value_at(datetime(2023, 3, 26, 3, 59, tzinfo=timezone.utc)) == 1
+    assert tree.value_at(end.astimezone(timezone.utc)) == 0
+    assert tree.area(start, end) == (end - start) // timedelta(microseconds=1)
+    assert tree.earliest_fit(start.astimezone(timezone.utc), timedelta(hours=6), 1) == start
+    assert tree.earliest_fit(start, timedelta(hours=7), 1) is None
+    assert tree.latest_fit(end, timedelta(hours=6), 1) == start
+
+
+def test_segment_tree_orders_a_fold_like_the_graph() -> None:
+    tz = ZoneInfo("Europe/Amsterdam")
+    # The clocks go back from 3 to 2 AM: the first 2:30 happens before the second 2:10 in UTC.
+    first = Interval(
+        datetime(2023, 10, 29, 2, 10, fold=1, tzinfo=tz), datetime(2023, 10, 29, 2, 30, tzinfo=tz), value=1
+    )
+    second = Interval(datetime(2023, 10, 29, 2, 30, tzinfo=tz), datetime(2023, 10, 29, 4, tzinfo=tz), value=2)
+    handler = IntervalHandler([first, second], tz=tz)
+
+    assert handler.get_area(first) == first.duration() == timedelta(minutes=20)
+    assert handler.get_area(Interval(first.start, second.end, value=1)) == timedelta(minutes=20 + 2 * 90)
+    assert handler.max_value(first) == 1
+    assert handler.min_value(second) == 2
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_segment_tree_orders_mixed_time_zones_like_the_graph(incremental: bool) -> None:
+    tz = ZoneInfo("Europe/Amsterdam")
+    # The clocks go back at 1 AM UTC, so that both intervals start at 2:30 on the wall clock of the handler.
+    first = Interval(
+        datetime(2024, 10, 27, 0, 30, tzinfo=timezone.utc), datetime(2024, 10, 27, 1, tzinfo=timezone.utc), 1
+    )
+    second = Interval(first.end, datetime(2024, 10, 27, 1, 30, tzinfo=timezone.utc), 2)
+    during = Interval(datetime(2024, 10, 27, tzinfo=timezone.utc), datetime(2024, 10, 27, 2, tzinfo=timezone.utc), 1)
+    handler = IntervalHandler([] if incremental else [first, second], tz=tz)
+    if incremental:
+        handler.add([Interval(datetime(2024, 10, 28, tzinfo=tz), datetime(2024, 10, 29, tzinfo=tz), 1)])
+        handler.get_area(during)
+        handler.add([first, second])
+
+    assert handler.get_area(during) == timedelta(minutes=30 + 2 * 30)
+    assert handler.max_value(first) == 1
+    assert handler.min_value(second) == 2
+    latest = handler.latest_fit(during.end, timedelta(minutes=30), 2)
+    # In the second 2 AM of the handler's time zone, which never equals a time point of another zone.
+    assert latest is not None and latest.astimezone(timezone.utc) == second.start
+
+
+def test_segment_tree_remove_unknown_change_point() -> None:
+    with pytest.raises(ValueError):
+        SegmentTree[datetime]().remove(datetime(2023, 1, 1), datetime(2023, 1, 10), 5)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_segment_tree_handler_matches_interval_handler(seed: int) -> None:
+    intervals = random_intervals(random.Random(seed), 60, hours=49, lengths=[0, 1, 2, 5, 24], since=THE_DATE)
+    handler = IntervalHandler(intervals=intervals)
+    tree_handler = SegmentTreeHandler(intervals=intervals)
+    probes = [THE_DATE + timedelta(minutes=30 * i) for i in range(-2, 160)]
+
+    assert sorted(tree_handler.intervals) == sorted(handler.intervals)
+    assert [tree_handler.value_at_time(t) for t in probes] == [handler.value_at_time(t) for t in probes]
+    expected_negative = handler.first_negative_point
+    assert tree_handler.first_negative_point == (None if expected_negative is None else expected_negative.time_point)
+
+    to_remove = intervals[::3]
+    handler.remove(to_remove)
+    tree_handler.remove(to_remove)
+    assert [tree_handler.value_at_time(t) for t in probes] == [handler.value_at_time(t) for t in probes]
+    expected_negative = handler.first_negative_point
+    assert tree_handler.first_negative_point == (None if expected_negative is None else expected_negative.time_point)
+
+
+def test_segment_tree_handler_remove_unknown_interval() -> None:
+    with pytest.raises(ValueError):
+        SegmentTreeHandler[datetime]().remove([Interval(THE_DATE, THE_DATE + timedelta(hours=1))])
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from pyintervals.ticks import from_ticks, tick_zone, to_ticks
+
+
+@pytest.mark.parametrize(
+    "time_point, ticks",
+    [
+        (datetime(1970, 1, 1), 0),
+        (datetime(1970, 1, 1, 0, 0, 1, 5), 1_000_005),
+        (datetime(1969, 12, 31, 23), -3_600_000_000),
+        (datetime(1970, 1, 1, 1, tzinfo=timezone(timedelta(hours=1))), 3_600_000_000),
+        (datetime(2023, 7, 1, 2, tzinfo=ZoneInfo("Europe/Amsterdam")), to_ticks(datetime(2023, 7, 1, 2))),
+    ],
+)
+def test_ticks_round_trip(time_point: datetime, ticks: int) -> None:
+    assert to_ticks(time_point) == ticks
+    converted = from_ticks(ticks, time_point)
+    assert converted == time_point
+    assert converted.tzinfo is time_point.tzinfo
+
+
+def test_ticks_follow_the_wall_clock_of_the_zone() -> None:
+    tz = ZoneInfo("Europe/Amsterdam")
+    # The clocks go back from 3 to 2 AM, so that the second 2:10 comes after the first 2:30.
+    assert to_ticks(datetime(2023, 10, 29, 2, 10, fold=1, tzinfo=tz)) < to_ticks(
+        datetime(2023, 10, 29, 2, 30, tzinfo=tz)
+    )
+    assert to_ticks(datetime(1970, 1, 1, tzinfo=timezone.utc), zone=timezone(timedelta(hours=1))) == 3_600_000_000
+    assert to_ticks(datetime(1970, 1, 1, 1), zone=timezone.utc) == 3_600_000_000
+
+
+def test_ticks_fall_back_to_utc_for_mixed_time_zones() -> None:
+    tz = ZoneInfo("Europe/Amsterdam")
+    assert tick_zone(tz, [datetime(2023, 1, 1, tzinfo=tz), datetime(2023, 1, 2)]) is tz
+    assert tick_zone(tz, [datetime(2023, 1, 1, tzinfo=tz), datetime(2023, 1, 1, tzinfo=timezone.utc)]) is timezone.utc
+    assert tick_zone(None, [datetime(2023, 1, 1, tzinfo=timezone.utc)]) is None
+    assert to_ticks(datetime.min.replace(tzinfo=tz), zone=timezone.utc) < to_ticks(datetime.min)
+    utc = datetime(2023, 10, 29, 3, 30, tzinfo=timezone.utc)
+    assert from_ticks(to_ticks(utc), datetime.min.replace(tzinfo=tz), timezone.utc) == utc
+
+
+@pytest.mark.parametrize("time_point", [0, 7, -3, 2.5])
+def test_numeric_ticks_are_the_time_points(time_point: float) -> None:
+    assert to_ticks(time_point) == time_point
+    assert from_ticks(to_ticks(time_point), time_point) == time_point
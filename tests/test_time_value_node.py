@@ -9,7 +9,7 @@ from sortedcontainers import SortedList
 
 from pyintervals import Interval
 from pyintervals.constants import TIME_ZERO
-from pyintervals.interval_handler import _relevant_nodes
+from pyintervals.interval_handler import _graph, _relevant_nodes
 from pyintervals.time_value_node import TimeValueNode
 
 
@@ -370,7 +370,7 @@ def test_relevant_nodes(
     interval,
     expected_node_count,
 ) -> None:
-    assert len(_relevant_nodes(nodes, interval)) == expected_node_count
+    assert len(_relevant_nodes(_graph(nodes), interval)) == expected_node_count
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import timedelta
+
+import pytest
+
+from pyintervals import Interval, IntervalHandler
+from pyintervals.views import MultisetView, SequenceView
+from tests.helpers import THE_DATE
+
+
+def test_sequence_view_follows_its_sequence() -> None:
+    items = [1, 2, 3]
+    view = SequenceView(items)
+    assert view == [1, 2, 3]
+    assert view[1:] == [2, 3]
+    assert view[-1] == 3
+    assert 2 in view
+
+    items.append(4)
+    assert len(view) == 4
+    assert list(reversed(view)) == [4, 3, 2, 1]
+
+    copied = view.copy()
+    items.clear()
+    assert view == []
+    assert copied == [1, 2, 3, 4]
+    assert not hasattr(view, "append")
+
+
+@pytest.mark.parametrize("index", range(-5, 5))
+def test_multiset_view_indexes_like_a_list(index: int) -> None:
+    counts = Counter({"a": 2, "b": 1, "c": 1})
+    view = MultisetView(counts)
+    assert view == ["a", "a", "b", "c"]
+    if -4 <= index < 4:
+        assert view[index] == ["a", "a", "b", "c"][index]
+    else:
+        with pytest.raises(IndexError):
+            view[index]
+    assert view[1:3] == ["a", "b"]
+    assert "b" in view and "d" not in view
+    assert list(reversed(view)) == ["c", "b", "a", "a"]
+    assert view.count("a") == 2 and view.count("d") == 0
+    elements = ["a", "a", "b", "c"]
+    for value in ["a", "b", "c"]:
+        for start in range(-5, 5):
+            for stop in [None, *range(-5, 5)]:
+                try:
+                    expected = elements.index(value, start, len(elements) if stop is None else stop)
+                except ValueError:
+                    with pytest.raises(ValueError):
+                        view.index(value, start, stop)
+                else:
+                    assert view.index(value, start, stop) == expected
+
+
+def test_handler_views_follow_changes() -> None:
+    first = Interval(THE_DATE, THE_DATE + timedelta(hours=2), value=1)
+    second = Interval(THE_DATE + timedelta(hours=1), THE_DATE + timedelta(hours=3), value=2)
+    handler = IntervalHandler([first])
+    intervals, graph = handler.intervals, handler.projection_graph
+    intervals_copy, graph_copy = intervals.copy(), graph.copy()
+    starting = handler.node_at_time(THE_DATE).starting_intervals
+
+    handler.add([second])
+    assert intervals == [first, second]
+    assert intervals_copy == [first]
+    assert len(graph) == len(graph_copy) + 2
+    assert graph.bisect_right(THE_DATE + timedelta(hours=1)) - 1 == graph.bisect_left(THE_DATE + timedelta(hours=1))
+    assert graph[graph.bisect_right(THE_DATE + timedelta(minutes=90)) - 1].value == 3
+    assert starting == [first]
+    assert handler.node_at_time(THE_DATE + timedelta(hours=1)).starting_intervals == [second]
+
+    handler.remove(handler.intervals)
+    assert intervals == []
+    assert starting == []
+
+    handler.add([first, second])
+    handler += handler
+    assert intervals == handler.intervals.copy()
+    assert graph == handler.projection_graph.copy()
+    assert graph[-1].time_point == THE_DATE + timedelta(hours=3)